@@ -2,625 +2,329 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import base64
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import asyncio
+import threading
+import os
+import re
+import sys
+from engine import (
+    TIMING_ENV, ACTIVE_TIMER, StageTimer, timed,
+    RNG_STREAMS, WAVE_PATTERNS, BAR_INTERVALS, make_rng, new_seed, bar_count, simulate_ensemble, simulate_asset,
+    Moments, PriceStats, VOLATILITY_ESTIMATORS, rolling_volatility,
+    PORTFOLIO_CAPITAL, portfolio_interval, portfolio_params, factor_correlation, simulate_portfolio,
+    portfolio_value, portfolio_asset_ohlcv,
+    SWEEP_METRICS, sweep_metrics,
+    SIM_CACHE_MAX_BYTES, SimulationCache, asset_key, simulate_scenario,
+    MAX_CHART_POINTS, MAX_CANDLES, UP_DOWN_COLORSCALE, chart_points, resample_ohlcv, extreme_bars, line_trace,
+    new_figure, compact_figure, plotly_template,
+    EXPORT_FORMATS, export_ohlcv,
+    LIVE_REFRESH_SECONDS, OHLCVRingBuffer, SimulatedFeed, ReplayServer, ReplayFeed, replay_file,
+    ingest_csv, DATASET_MAX_BARS, dataset_info, query_dataset, dataset_intervals
+)
 
 # Note: For full Google OAuth, install: pip install google-auth-oauthlib streamlit-oauth
 # This is a simplified version. For production, use proper OAuth flow.
 
-# Page configuration
-st.set_page_config(
-    page_title="Crypto Volatility Visualizer",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Scenario pool workers are started by forkserver, which imports this script
+# as __mp_main__ to unpickle their work. They only need its definitions, so
+# everything that renders is skipped for them
+IS_POOL_WORKER = __name__ == '__mp_main__'
 
-# Custom CSS - Enhanced with improved welcome page and dropdown styling
-st.markdown("""
-    <style>
-    /* Import Google Font */
-    @import url('https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    * {
-        font-family: 'Outfit', sans-serif;
-    }
-    
-    /* Main Background */
-    .stApp {
-        background: linear-gradient(135deg, #0f1419 0%, #1a1f2e 100%);
-    }
-    
-    /* Hide Streamlit Branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Welcome Page Styles */
-    .welcome-container {
-        background: linear-gradient(145deg, rgba(20,25,35,0.9), rgba(30,35,50,0.8));
-        border-radius: 24px;
-        padding: 60px 40px;
-        box-shadow: 0 20px 60px rgba(0,0,0,0.5);
-        border: 1px solid rgba(45,212,191,0.1);
-        backdrop-filter: blur(10px);
-        margin-top: 40px;
-    }
-    
-    .welcome-title {
-        font-size: 3.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #2dd4bf 0%, #8b5cf6 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 10px;
-        letter-spacing: -1px;
-    }
-    
-    .welcome-subtitle {
-        color: #94a3b8;
-        text-align: center;
-        font-size: 1.2rem;
-        margin-bottom: 40px;
-        font-weight: 300;
-    }
-    
-    .welcome-badges {
-        display: flex;
-        justify-content: center;
-        gap: 20px;
-        margin-bottom: 40px;
-        flex-wrap: wrap;
-    }
-    
-    .badge {
-        background: rgba(45,212,191,0.1);
-        border: 1px solid rgba(45,212,191,0.3);
-        padding: 10px 24px;
-        border-radius: 50px;
-        color: #2dd4bf;
-        font-size: 0.9rem;
-        font-weight: 500;
-    }
-    
-    .form-section-title {
-        color: #2dd4bf;
-        font-size: 1.8rem;
-        font-weight: 600;
-        text-align: center;
-        margin: 30px 0 30px 0;
-    }
-    
-    .form-label {
-        color: #e2e8f0;
-        font-size: 0.95rem;
-        font-weight: 500;
-        margin-bottom: 8px;
-        display: block;
-    }
-    
-    /* Input Field Styling */
-    .stTextInput > div > div > input {
-        background-color: #1a1f2e !important;
-        border: 1px solid rgba(45,212,191,0.2) !important;
-        border-radius: 12px !important;
-        color: #ecf0f1 !important;
-        padding: 12px 16px !important;
-        font-size: 1rem !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #2dd4bf !important;
-        box-shadow: 0 0 0 2px rgba(45,212,191,0.1) !important;
-    }
-    
-    .stTextInput > div > div > input::placeholder {
-        color: #64748b !important;
-    }
-    
-    /* Number Input Styling */
-    .stNumberInput > div > div > input {
-        background-color: #1a1f2e !important;
-        border: 1px solid rgba(45,212,191,0.2) !important;
-        border-radius: 12px !important;
-        color: #ecf0f1 !important;
-        padding: 12px 16px !important;
-        font-size: 1rem !important;
-    }
-    
-    .stNumberInput > div > div > input:focus {
-        border-color: #2dd4bf !important;
-        box-shadow: 0 0 0 2px rgba(45,212,191,0.1) !important;
-    }
-    
-    /* Selectbox Styling - FIXED */
-    .stSelectbox > div > div {
-        background-color: #1a1f2e !important;
-        border: 1px solid rgba(45,212,191,0.2) !important;
-        border-radius: 12px !important;
-    }
-    
-    .stSelectbox > div > div > div {
-        background-color: #1a1f2e !important;
-        color: #ecf0f1 !important;
-        padding: 12px 16px !important;
-        white-space: nowrap !important;
-        overflow: hidden !important;
-        text-overflow: ellipsis !important;
-    }
-    
-    /* Remove red border on focus */
-    .stSelectbox > div > div:focus-within {
-        border-color: #2dd4bf !important;
-        box-shadow: 0 0 0 2px rgba(45,212,191,0.1) !important;
-    }
-    
-    /* Dropdown Menu Styling */
-    [data-baseweb="popover"] {
-        background-color: #1a1f2e !important;
-    }
-    
-    [data-baseweb="select"] > div {
-        background-color: #1a1f2e !important;
-        border-color: rgba(45,212,191,0.2) !important;
-    }
-    
-    [data-baseweb="select"] > div:focus {
-        border-color: #2dd4bf !important;
-        box-shadow: 0 0 0 2px rgba(45,212,191,0.1) !important;
-    }
-    
-    /* Dropdown Options */
-    [role="option"] {
-        background-color: #1a1f2e !important;
-        color: #ecf0f1 !important;
-        padding: 12px 16px !important;
-        white-space: normal !important;
-        overflow: visible !important;
-        min-height: 48px !important;
-        display: flex !important;
-        align-items: center !important;
-    }
-    
-    [role="option"]:hover {
-        background-color: rgba(45,212,191,0.2) !important;
-    }
-    
-    ul[role="listbox"] {
-        background-color: #1a1f2e !important;
-        border: 1px solid rgba(45,212,191,0.3) !important;
-        border-radius: 12px !important;
-        max-height: 300px !important;
-    }
-    
-    /* Fix for sidebar selectbox text wrapping */
-    [data-testid="stSidebar"] .stSelectbox > div > div > div {
-        white-space: normal !important;
-        line-height: 1.3 !important;
-        min-height: 40px !important;
-    }
-    
-    /* Submit Button Styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #2dd4bf 0%, #10b981 100%) !important;
-        color: #0f1419 !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 14px 32px !important;
-        font-size: 1.1rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-        width: 100% !important;
-        margin-top: 20px !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 10px 30px rgba(45,212,191,0.3) !important;
-    }
-    
-    /* Google Login Button */
-    .google-login-btn {
-        background: white !important;
-        color: #1f2937 !important;
-        border: 1px solid rgba(45,212,191,0.2) !important;
-        border-radius: 12px !important;
-        padding: 14px 32px !important;
-        font-size: 1rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-        width: 100% !important;
-        margin-top: 10px !important;
-        display: flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-        gap: 12px !important;
-        cursor: pointer !important;
-    }
-    
-    .google-login-btn:hover {
-        background: #f9fafb !important;
-        border-color: #2dd4bf !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 10px 30px rgba(45,212,191,0.2) !important;
-    }
-    
-    .divider {
-        display: flex;
-        align-items: center;
-        text-align: center;
-        margin: 20px 0;
-        color: #64748b;
-        font-size: 0.9rem;
-    }
-    
-    .divider::before,
-    .divider::after {
-        content: '';
-        flex: 1;
-        border-bottom: 1px solid rgba(45,212,191,0.2);
-    }
-    
-    .divider::before {
-        margin-right: 15px;
-    }
-    
-    .divider::after {
-        margin-left: 15px;
-    }
-    
-    /* Welcome Footer */
-    .welcome-footer {
-        text-align: center;
-        margin-top: 50px;
-        color: #64748b;
-        font-size: 0.9rem;
-    }
-    
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 20px;
-        margin-top: 30px;
-    }
-    
-    .feature-card {
-        background: rgba(30,35,50,0.5);
-        border: 1px solid rgba(45,212,191,0.1);
-        border-radius: 16px;
-        padding: 20px;
-        text-align: center;
-        transition: all 0.3s ease;
-    }
-    
-    .feature-card:hover {
-        border-color: rgba(45,212,191,0.4);
-        transform: translateY(-5px);
-    }
-    
-    .feature-icon {
-        font-size: 2.5rem;
-        margin-bottom: 10px;
-    }
-    
-    .feature-title {
-        color: #e2e8f0;
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 8px;
-    }
-    
-    .feature-desc {
-        color: #94a3b8;
-        font-size: 0.9rem;
-        line-height: 1.4;
-    }
-    
-    /* Metric Cards */
-    .metric-card {
-        background: linear-gradient(145deg, rgba(20,25,35,0.8), rgba(30,35,50,0.6));
-        border-radius: 16px;
-        padding: 20px;
-        border: 1px solid rgba(45,212,191,0.1);
-        text-align: center;
-    }
-    
-    .metric-title {
-        color: #94a3b8;
-        font-size: 0.85rem;
-        font-weight: 500;
-        margin-bottom: 8px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    .metric-value {
-        color: #2dd4bf;
-        font-size: 1.8rem;
-        font-weight: 700;
-        margin-bottom: 4px;
-    }
-    
-    .metric-label {
-        color: #64748b;
-        font-size: 0.8rem;
-    }
-    
-    /* Header Styles */
-    .app-header {
-        background: linear-gradient(145deg, rgba(20,25,35,0.95), rgba(30,35,50,0.85));
-        border-radius: 16px;
-        padding: 24px 32px;
-        margin-bottom: 24px;
-        border: 1px solid rgba(45,212,191,0.1);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }
-    
-    .app-title {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #2dd4bf;
-    }
-    
-    .app-subtitle {
-        color: #94a3b8;
-        font-size: 0.9rem;
-    }
-    
-    .live-indicator {
-        background: rgba(16,185,129,0.2);
-        border: 1px solid #10b981;
-        padding: 6px 16px;
-        border-radius: 50px;
-        color: #10b981;
-        font-size: 0.85rem;
-        font-weight: 600;
-    }
-    
-    /* Tabs Styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: rgba(20,25,35,0.6);
-        border-radius: 12px;
-        padding: 6px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent;
-        border-radius: 8px;
-        color: #94a3b8;
-        font-weight: 500;
-        padding: 10px 20px;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, rgba(45,212,191,0.2), rgba(139,92,246,0.2));
-        color: #2dd4bf !important;
-    }
-    
-    /* Sidebar Styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #141925 0%, #1e2330 100%);
-        border-right: 1px solid rgba(45,212,191,0.1);
-    }
-    
-    .sidebar-title {
-        color: #2dd4bf;
-        font-size: 1.2rem;
-        font-weight: 700;
-        margin-bottom: 10px;
-        text-align: center;
-    }
-    
-    .sidebar-subtitle {
-        color: #94a3b8;
-        font-size: 0.85rem;
-        text-align: center;
-        margin-bottom: 24px;
-    }
-    
-    /* Slider Styling */
-    .stSlider > div > div > div > div {
-        background-color: #2dd4bf !important;
-    }
-    
-    .stSlider > div > div > div {
-        background-color: rgba(45,212,191,0.2) !important;
-    }
-    
-    /* Radio Button Styling */
-    .stRadio > div {
-        background-color: rgba(20,25,35,0.6);
-        padding: 10px;
-        border-radius: 12px;
-    }
-    
-    .stRadio > div > label > div[data-testid="stMarkdownContainer"] > p {
-        color: #ecf0f1;
-    }
-    
-    /* Chart Container */
-    .chart-container {
-        background: rgba(15,20,25,0.4);
-        border-radius: 16px;
-        padding: 20px;
-        border: 1px solid rgba(45,212,191,0.05);
-        margin-bottom: 20px;
-    }
-    
-    .chart-title {
-        color: #e2e8f0;
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 16px;
-    }
-    
-    /* Volatility Badge */
-    .volatility-high {
-        background: rgba(248,113,113,0.2);
-        border: 1px solid #f87171;
-        color: #f87171;
-        padding: 4px 12px;
-        border-radius: 50px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        display: inline-block;
-    }
-    
-    .volatility-low {
-        background: rgba(16,185,129,0.2);
-        border: 1px solid #10b981;
-        color: #10b981;
-        padding: 4px 12px;
-        border-radius: 50px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        display: inline-block;
-    }
-    
-    /* Data Table Styling */
-    .stDataFrame {
-        background-color: rgba(20,25,35,0.6) !important;
-        border-radius: 12px;
-    }
-    
-    /* Download Button */
-    .stDownloadButton > button {
-        background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 10px !important;
-        padding: 10px 20px !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Footer */
-    .app-footer {
-        text-align: center;
-        padding: 30px;
-        color: #64748b;
-        font-size: 0.9rem;
-        margin-top: 40px;
-        border-top: 1px solid rgba(45,212,191,0.1);
-    }
-    
-    /* Spacing */
-    .spacer {
-        height: 20px;
-    }
-    
-    .spacer-lg {
-        height: 40px;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS - Enhanced with improved welcome page and dropdown styling.
+# The stylesheet is read and minified once per server process
+THEME_CSS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'theme.css')
 
-# Initialize session state
-if 'initialized' not in st.session_state:
-    st.session_state.initialized = False
-    st.session_state.user_name = ""
-    st.session_state.user_email = ""
-    st.session_state.generated_data = None
+@st.cache_resource
+def get_theme_css():
+    """Minified theme stylesheet as a <style> block, shared by every session"""
+    with open(THEME_CSS) as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s*([{};])\s*', r'\1', re.sub(r'\s+', ' ', css))
+    return f'<style>{css.strip()}</style>'
 
 # Helper functions
-def gauss_random():
-    """Generate Gaussian random number"""
-    u = 0
-    v = 0
-    while u == 0:
-        u = np.random.random()
-    while v == 0:
-        v = np.random.random()
-    return np.sqrt(-2.0 * np.log(u)) * np.cos(2.0 * np.pi * v)
+# The models live in the engine package; these wire them to Streamlit's
+# caches, query params and session state
+def timing_enabled():
+    """Whether this rerun should be timed"""
+    return os.environ.get(TIMING_ENV, '0') not in ('', '0') or st.query_params.get('timing') == '1'
 
-def simulate_price(days, base, amplitude, frequency, drift, noise, pattern):
-    """Simulate cryptocurrency price movements"""
-    prices = []
-    dates = []
-    start_date = datetime.now() - timedelta(days=days)
-    
-    for i in range(days):
-        t = (i / days) * 2 * np.pi * frequency
-        wave = 0
-        
-        if pattern == 'Sine Wave (Smooth Cycles)':
-            wave = amplitude * np.sin(t)
-        elif pattern == 'Cosine Wave (Phase Shift)':
-            wave = amplitude * np.cos(t)
-        elif pattern == 'Combined Waves':
-            wave = amplitude * (0.6 * np.sin(t) + 0.4 * np.cos(2 * t))
-        elif pattern == 'Realistic Behavior':
-            wave = amplitude * (0.5 * np.sin(t) + 0.3 * np.cos(1.7 * t) + 0.2 * np.sin(3.1 * t))
-        
-        trend_val = drift * i
-        noise_val = noise * gauss_random()
-        price = max(100, base + wave + trend_val + noise_val)
-        d = start_date + timedelta(days=i)
-        
-        dates.append(d)
-        prices.append(price)
-    
-    return dates, prices
+@st.cache_resource
+def get_simulation_cache():
+    """Simulation cache shared by every session in this server process"""
+    return SimulationCache(SIM_CACHE_MAX_BYTES)
 
-def generate_ohlcv(dates, close_prices):
-    """Generate OHLCV data from close prices"""
-    data = []
-    for i, (d, close) in enumerate(zip(dates, close_prices)):
-        spread = close * (0.01 + np.random.random() * 0.03)
-        open_price = close + (np.random.random() - 0.5) * spread
-        high = max(open_price, close) + np.random.random() * spread
-        low = min(open_price, close) - np.random.random() * spread
-        volume = int(500 + np.random.random() * 9500)
-        
-        data.append({
-            'date': d,
-            'open': open_price,
-            'high': high,
-            'low': low,
-            'close': close,
-            'volume': volume
-        })
-    
-    return pd.DataFrame(data)
+@st.cache_resource
+def get_process_pool():
+    """Worker pool shared by every session for scenario simulations"""
+    # Workers are not forked from this multi-threaded server, where a child could
+    # inherit a lock held by another thread; they come from a forkserver (spawn
+    # where that is unavailable). Both import this script once as __mp_main__,
+    # which IS_POOL_WORKER keeps from rendering anything
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    # Workers copy this process's sys.path when they start, which may be after
+    # this run. Streamlit only adds the app directory (for the engine package)
+    # for the length of a run and then removes its own entry, so it is appended
+    # here as a second, lasting one
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context(method))
 
-def get_plotly_layout():
-    """Get consistent Plotly layout"""
-    return {
-        'paper_bgcolor': 'rgba(0,0,0,0)',
-        'plot_bgcolor': 'rgba(15,20,25,0.4)',
-        'font': {'color': '#ecf0f1', 'family': 'Outfit, sans-serif', 'size': 11},
-        'margin': {'l': 50, 'r': 20, 't': 10, 'b': 40},
-        'xaxis': {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)'},
-        'yaxis': {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)', 'tickprefix': '$'},
-        'showlegend': False,
-        'hovermode': 'x unified'
-    }
+def load_scenarios(specs):
+    """Fetch (frame, stats) for many simulate_asset argument tuples, simulating misses in parallel"""
+    cache = get_simulation_cache()
+    keys = [(('asset',) + asset_key(*spec), ('stats',) + asset_key(*spec)) for spec in specs]
+    results = [(cache.get(frame_key), cache.get(stats_key)) for frame_key, stats_key in keys]
+    missing = [i for i, (df, stats) in enumerate(results) if df is None or stats is None]
+    
+    # Results are returned as computed, not read back: a batch larger than the
+    # cache's byte cap would evict its own early results before they were read
+    futures = {}
+    if len(missing) > 1:
+        pool = get_process_pool()
+        futures = {i: pool.submit(simulate_scenario, *specs[i]) for i in missing}
+    for i in missing:
+        df, stats = futures[i].result() if futures else simulate_scenario(*specs[i])
+        cache.put(keys[i][0], df)
+        cache.put(keys[i][1], stats)
+        results[i] = (df, stats)
+    return results
 
-# Welcome Page
-if not st.session_state.initialized:
-    # Add spacing at top
-    st.markdown('<div style="height: 40px;"></div>', unsafe_allow_html=True)
-    
-    # Center the welcome content
-    col1, col2, col3 = st.columns([0.5, 3, 0.5])
-    
-    with col2:
-        # Opening container div
-        st.markdown('<div class="welcome-container">', unsafe_allow_html=True)
+def load_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval='1d'):
+    """Fetch a simulated asset from the shared cache, simulating it on a miss"""
+    key = ('asset',) + asset_key(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval)
+    return get_simulation_cache().get_or_compute(
+        key, lambda: simulate_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval))
+
+def load_asset_stats(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval='1d'):
+    """Fetch an asset's PriceStats from the shared cache, computing them on a miss"""
+    key = ('stats',) + asset_key(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval)
+    return get_simulation_cache().get_or_compute(
+        key, lambda: PriceStats.from_frame(
+            load_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval)))
+
+def load_portfolio(n_assets, avg_corr, days, base, amplitude, frequency, drift, noise, seed, interval='1d'):
+    """Fetch a correlated portfolio from the shared cache, simulating it on a miss"""
+    key = ('portfolio', n_assets, avg_corr, amplitude, frequency, drift, noise, base, days, interval, seed)
+    
+    def compute():
+        rng = make_rng(seed, RNG_STREAMS['portfolio'])
+        params = portfolio_params(n_assets, base, amplitude, frequency, drift, noise, avg_corr, rng)
+        corr = factor_correlation(params['loading'].to_numpy())
+        dates, prices = simulate_portfolio(days, params, corr, interval, rng)
+        return params, corr, dates, prices
+    
+    return get_simulation_cache().get_or_compute(key, compute)
+
+def load_sweep(days, base, drift, pattern, amplitudes, noises, frequencies, seed):
+    """Fetch a sensitivity sweep from the shared cache, computing it on a miss"""
+    key = ('sweep', days, base, drift, pattern, tuple(amplitudes), tuple(noises), tuple(frequencies), seed)
+    return get_simulation_cache().get_or_compute(
+        key, lambda: sweep_metrics(days, base, drift, pattern, amplitudes, noises, frequencies,
+                                   make_rng(seed, RNG_STREAMS['sweep'])))
+
+def load_ensemble(n_paths, days, base, amplitude, frequency, drift, noise, pattern, seed, stream):
+    """Fetch a Monte Carlo ensemble from the shared cache, simulating it on a miss"""
+    key = ('ensemble', n_paths, pattern, amplitude, frequency, drift, noise, base, days, seed, stream)
+    return get_simulation_cache().get_or_compute(
+        key, lambda: simulate_ensemble(n_paths, days, base, amplitude, frequency, drift, noise, pattern,
+                                       make_rng(seed, stream)))
+
+@st.cache_resource
+def get_event_loop():
+    """Background asyncio loop shared by replay servers and feed clients"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='replay-loop', daemon=True).start()
+    return loop
+
+@st.cache_resource
+def get_replay_server(path, bars_per_sec):
+    """One replay server per (file, rate), started on the shared loop"""
+    server = ReplayServer(path, bars_per_sec)
+    asyncio.run_coroutine_threadsafe(server.start(), get_event_loop()).result()
+    return server
+
+# Real datasets: local CSVs are listed from CVV_DATA_DIR (default ./data)
+DATA_DIR_ENV = 'CVV_DATA_DIR'
+
+def data_dir():
+    return os.environ.get(DATA_DIR_ENV) or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def local_datasets():
+    """CSV files available in the local data directory"""
+    path = data_dir()
+    if not os.path.isdir(path):
+        return []
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.csv'))
+
+def ingest_dataset(upload=None, path=None):
+    """Parquet cache path of an uploaded or local CSV, converting it on first use"""
+    if upload is not None:
+        key = ('dataset-path', 'upload', upload.file_id)
+        source = upload
+    else:
+        stat = os.stat(path)
+        key = ('dataset-path', path, stat.st_mtime_ns, stat.st_size)
+        source = path
+    return get_simulation_cache().get_or_compute(key, lambda: ingest_csv(source))
+
+def load_dataset_info(path):
+    """Fetch a real dataset's date span, size and native interval from the shared cache"""
+    return get_simulation_cache().get_or_compute(('dataset-info', path), lambda: dataset_info(path))
+
+def load_dataset_frame(path, start, end, interval=None):
+    """Fetch a window of a real dataset from the shared cache, querying the Parquet file on a miss"""
+    return get_simulation_cache().get_or_compute(
+        ('dataset', path, start, end, interval), lambda: query_dataset(path, start, end, interval))
+
+def load_dataset_stats(path, start, end, interval=None):
+    """Fetch the PriceStats of a window of a real dataset from the shared cache"""
+    return get_simulation_cache().get_or_compute(
+        ('dataset-stats', path, start, end, interval),
+        lambda: PriceStats.from_frame(load_dataset_frame(path, start, end, interval)))
+
+# Default sidebar parameters of the dashboard asset
+DEFAULT_ASSET = {
+    'days': 90,
+    'base': 45000,
+    'amplitude': 5000,
+    'frequency': 3,
+    'drift': 50,
+    'noise': 1500,
+    'pattern': 'Sine Wave (Smooth Cycles)',
+    'interval': '1d',
+}
+
+# Default Compare-tab scenarios: the original stable/volatile presets
+DEFAULT_SCENARIOS = pd.DataFrame([
+    {'name': 'Stable Asset', 'pattern': 'Sine Wave (Smooth Cycles)', 'amplitude': 500, 'frequency': 2, 'drift': 20, 'noise': 200},
+    {'name': 'Volatile Asset', 'pattern': 'Realistic Behavior', 'amplitude': 8000, 'frequency': 5, 'drift': 30, 'noise': 5000},
+])
+SCENARIO_COLORS = ['#10b981', '#f87171', '#2dd4bf', '#8b5cf6', '#f59e0b', '#3b82f6', '#ec4899', '#a3e635']
+
+# Views; only the open one runs. Streamlit drops the state of widgets that are
+# not rendered, so each view's keyed settings are written back while it is closed
+VIEWS = ["📊 Dashboard", "📈 Analysis", "⚖️ Compare", "📋 Data Explorer"]
+VIEW_STATE_KEYS = [
+    ['chart_type'],
+    ['vol_window', 'sweep_on', 'sweep_amp_range', 'sweep_n_amp', 'sweep_noise_range', 'sweep_n_noise',
+     'sweep_freq_range', 'sweep_n_freq', 'sweep_metric'],
+    ['portfolio_n_assets', 'portfolio_avg_corr'],  # the scenario editor keeps its table under scenario_table
+    ['export_format', 'explorer_page_size', 'explorer_page'],
+]
+
+# Warm start: the default asset and Compare presets are simulated once per
+# server process, in the background while the first visitor is on the welcome
+# page, and pinned in the shared cache. New sessions start on the process's
+# default seed so they all land on these precomputed results
+@st.cache_resource
+def default_seed():
+    """Starting seed of every new session in this server process"""
+    return new_seed()
+
+def default_specs(seed):
+    """simulate_asset arguments of the default dashboard asset and Compare presets"""
+    d = DEFAULT_ASSET
+    specs = [(d['days'], d['base'], d['amplitude'], d['frequency'], d['drift'], d['noise'], d['pattern'],
+              seed, RNG_STREAMS['main'], d['interval'])]
+    specs += [(d['days'], d['base'], row.amplitude, row.frequency, row.drift, row.noise, row.pattern,
+               seed, (RNG_STREAMS['compare'], k), d['interval'])
+              for k, row in enumerate(DEFAULT_SCENARIOS.itertuples(index=False))]
+    return specs
+
+def precompute_defaults(cache, seed):
+    """Simulate the default specs and pin the results in the cache"""
+    # The defaults take milliseconds in this thread; starting the worker pool
+    # for them would cost far more, so it is left for Compare misses
+    for spec in default_specs(seed):
+        df, stats = simulate_scenario(*spec)
+        cache.pin(('asset',) + asset_key(*spec), df)
+        cache.pin(('stats',) + asset_key(*spec), stats)
+    plotly_template()
+
+@st.cache_resource
+def warm_start():
+    """Background thread precomputing the defaults, started once per server process"""
+    thread = threading.Thread(
+        target=precompute_defaults,
+        args=(get_simulation_cache(), default_seed()),
+        name='warm-start',
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_panel(full_resolution=False):
+    """Live price panel; reruns on its own timer without rerunning the page"""
+    live = st.session_state.live
+    new_bars = live['feed'].drain()
+    live['buffer'].append(new_bars)
+    live['stats'].update_frame(new_bars)
+    live['received'] += len(new_bars)
+    frame = live['buffer'].to_frame()
+    stats = live['stats']
+    
+    # A replay plays its file once; bars stop at its last timestamp rather than looping back in time
+    ended = ' · replay finished' if live['feed'].finished else ''
+    st.markdown(f'<div class="chart-title">📡 Live Feed · {live["received"]:,} new bars · {len(frame):,}/{live["buffer"].capacity:,} buffered{ended}</div>', unsafe_allow_html=True)
+    if frame.empty:
+        st.markdown('<div style="color: #94a3b8;">Waiting for the first bars…</div>', unsafe_allow_html=True)
+        return
+    
+    live_x, live_y = chart_points(frame['date'], frame['close'], full_resolution)
+    fig_live = new_figure(height=260)
+    fig_live.add_trace(line_trace(len(live_y))(
+        x=live_x,
+        y=live_y,
+        mode='lines',
+        line=dict(color='#10b981', width=2)
+    ))
+    st.plotly_chart(compact_figure(fig_live), width="stretch", config={'displayModeBar': False})
+    st.markdown(f'<div style="color: #94a3b8; font-size: 0.85rem;">Session stats over {stats.close.count:,} bars · Last ${stats.last:,.2f} · σ ${stats.close.std:,.0f} · Swing ${stats.swing:,.0f} · Return {stats.total_return:+.2f}%</div>', unsafe_allow_html=True)
+
+if not IS_POOL_WORKER:
+    # Page configuration
+    st.set_page_config(
+        page_title="Crypto Volatility Visualizer",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(get_theme_css(), unsafe_allow_html=True)
+    
+    warm_start()
+    
+    # Initialize session state
+    if 'initialized' not in st.session_state:
+        st.session_state.initialized = False
+        st.session_state.user_name = ""
+        st.session_state.user_email = ""
+        st.session_state.generated_data = None
+        st.session_state.seed = default_seed()
+    
+    # Welcome Page
+    if not st.session_state.initialized:
+        # Add spacing at top
+        st.markdown('<div style="height: 40px;"></div>', unsafe_allow_html=True)
         
-        # Title and subtitle
-        st.markdown("""
+        # Center the welcome content
+        col1, col2, col3 = st.columns([0.5, 3, 0.5])
+        
+        with col2:
+            # Opening container div
+            st.markdown('<div class="welcome-container">', unsafe_allow_html=True)
+            
+            # Title and subtitle
+            st.markdown("""
             <div class="welcome-title">📊 Crypto Volatility Visualizer</div>
             <div class="welcome-subtitle">🚀 Real-time Data Analysis & Market Insights</div>
         """, unsafe_allow_html=True)
         
-        # Badges
-        st.markdown("""
+            # Badges
+            st.markdown("""
             <div class="welcome-badges">
                 <span class="badge">📊 INTERACTIVE</span>
                 <span class="badge">📈 REAL-TIME</span>
@@ -628,8 +332,8 @@ if not st.session_state.initialized:
             </div>
         """, unsafe_allow_html=True)
         
-        # Feature cards
-        st.markdown("""
+            # Feature cards
+            st.markdown("""
             <div class="feature-grid">
                 <div class="feature-card">
                     <div class="feature-icon">📈</div>
@@ -649,562 +353,1055 @@ if not st.session_state.initialized:
             </div>
         """, unsafe_allow_html=True)
         
-        # Form section title
-        st.markdown('<div class="form-section-title">⚡ Get Started in Seconds</div>', unsafe_allow_html=True)
-        
-        # Closing container div (form will be inside)
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Simple form with just name
-        with st.form("welcome_form"):
-            st.markdown('<div class="form-label">👤 Enter Your Name</div>', unsafe_allow_html=True)
-            name = st.text_input("Name", label_visibility="collapsed", placeholder="Enter your name", key="name_input")
+            # Form section title
+            st.markdown('<div class="form-section-title">⚡ Get Started in Seconds</div>', unsafe_allow_html=True)
             
-            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-            submitted = st.form_submit_button("🚀 Start Exploring", width="stretch")
+            # Closing container div (form will be inside)
+            st.markdown('</div>', unsafe_allow_html=True)
             
-            if submitted and name:
-                st.session_state.initialized = True
-                st.session_state.user_name = name
-                st.session_state.user_email = ""
-                st.rerun()
-        
-        # Footer
-        st.markdown("""
+            # Simple form with just name
+            with st.form("welcome_form"):
+                st.markdown('<div class="form-label">👤 Enter Your Name</div>', unsafe_allow_html=True)
+                name = st.text_input("Name", label_visibility="collapsed", placeholder="Enter your name", key="name_input")
+                
+                st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                submitted = st.form_submit_button("🚀 Start Exploring", width="stretch")
+                
+                if submitted and name:
+                    st.session_state.initialized = True
+                    st.session_state.user_name = name
+                    st.session_state.user_email = ""
+                    st.rerun()
+            
+            # Footer
+            st.markdown("""
             <div class="welcome-footer">
                 <p>💡 Analyze cryptocurrency price patterns with interactive mathematical simulations</p>
                 <p style="margin-top: 10px; font-size: 0.85rem;">Powered by Advanced Analytics & Real-time Processing</p>
             </div>
         """, unsafe_allow_html=True)
-
-# Main Application
-else:
-    # Header
-    st.markdown(f"""
+    
+    # Main Application
+    else:
+        # Header
+        st.markdown(f"""
         <div class="app-header">
             <div>
                 <div class="app-title">📊 Crypto Volatility Visualizer</div>
                 <div class="app-subtitle">Real-time Data Analysis & Market Insights</div>
             </div>
-            <div class="live-indicator">● LIVE</div>
+            <div class="live-indicator">{'● LIVE' if st.session_state.get('live_on') else '● SIMULATED'}</div>
         </div>
     """, unsafe_allow_html=True)
     
-    # Navigation Tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "📈 Analysis", "⚖️ Compare", "📋 Data Explorer"])
-    
-    # Sidebar Controls
-    with st.sidebar:
-        st.markdown("""
+        # Per-stage timing for this rerun (None unless enabled)
+        timer = StageTimer() if timing_enabled() else None
+        ACTIVE_TIMER.set(timer)
+        
+        # Navigation Tabs: selecting a tab reruns the script with only that view open
+        tabs = st.tabs(VIEWS, key="view", on_change="rerun")
+        tab1, tab2, tab3, tab4 = tabs
+        for tab, keys in zip(tabs, VIEW_STATE_KEYS):
+            if not tab.open:
+                for key in keys:
+                    if key in st.session_state:
+                        st.session_state[key] = st.session_state[key]
+        
+        # Sidebar Controls
+        with st.sidebar:
+            st.markdown("""
             <div class="sidebar-title">⚙️ MARKET SIMULATION</div>
             <div class="sidebar-subtitle">Configure your analysis</div>
             <div class="spacer"></div>
         """, unsafe_allow_html=True)
         
-        # Price Pattern
-        st.markdown('<div class="form-label">📊 Price Pattern</div>', unsafe_allow_html=True)
-        pattern = st.selectbox(
-            "Price Pattern",
-            ["Sine Wave (Smooth Cycles)", "Cosine Wave (Phase Shift)", "Combined Waves", "Realistic Behavior"],
-            label_visibility="collapsed"
-        )
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Amplitude
-        st.markdown('<div class="form-label">💰 Amplitude ($)</div>', unsafe_allow_html=True)
-        amplitude = st.slider(
-            "Amplitude ($)",
-            min_value=500,
-            max_value=15000,
-            value=5000,
-            step=100,
-            help="Low Swing ← → High Swing",
-            label_visibility="collapsed"
-        )
-        st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${amplitude:,}</div>', unsafe_allow_html=True)
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Frequency
-        st.markdown('<div class="form-label">⚡ Frequency (Speed)</div>', unsafe_allow_html=True)
-        frequency = st.slider(
-            "Frequency (Speed)",
-            min_value=1,
-            max_value=20,
-            value=3,
-            step=1,
-            help="Slow ← → Fast",
-            label_visibility="collapsed"
-        )
-        st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">{frequency}</div>', unsafe_allow_html=True)
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Drift
-        st.markdown('<div class="form-label">📈 Drift (Trend)</div>', unsafe_allow_html=True)
-        drift = st.slider(
-            "Drift (Trend)",
-            min_value=-200,
-            max_value=200,
-            value=50,
-            step=10,
-            help="Downtrend ← → Uptrend",
-            label_visibility="collapsed"
-        )
-        st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">{drift}</div>', unsafe_allow_html=True)
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Noise
-        st.markdown('<div class="form-label">🎲 Noise (Randomness)</div>', unsafe_allow_html=True)
-        noise = st.slider(
-            "Noise (Randomness)",
-            min_value=0,
-            max_value=8000,
-            value=1500,
-            step=100,
-            help="None ← → Max",
-            label_visibility="collapsed"
-        )
-        st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${noise:,}</div>', unsafe_allow_html=True)
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Base Price
-        st.markdown('<div class="form-label">💵 Base Price ($)</div>', unsafe_allow_html=True)
-        base_price = st.slider(
-            "Base Price ($)",
-            min_value=10000,
-            max_value=100000,
-            value=45000,
-            step=1000,
-            help="10k ← → 100k",
-            label_visibility="collapsed"
-        )
-        st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${base_price:,}</div>', unsafe_allow_html=True)
-    
-    # Generate Data
-    days = 90
-    dates, prices = simulate_price(days, base_price, amplitude, frequency, drift, noise, pattern)
-    df = generate_ohlcv(dates, prices)
-    st.session_state.generated_data = df
-    
-    # Calculate Metrics
-    last_price = prices[-1]
-    mean_price = np.mean(prices)
-    std_dev = np.std(prices)
-    avg_range = df['high'].sub(df['low']).mean()
-    avg_volume = df['volume'].mean()
-    
-    # Dashboard Tab
-    with tab1:
-        # Metrics Row
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Current Price</div>
-                    <div class="metric-value">${int(last_price):,}</div>
-                    <div class="metric-label">Close</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Volatility (σ)</div>
-                    <div class="metric-value">${int(std_dev):,}</div>
-                    <div class="metric-label">Std Dev</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Daily Range</div>
-                    <div class="metric-value">${int(avg_range):,}</div>
-                    <div class="metric-label">Avg H-L</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Trading Volume</div>
-                    <div class="metric-value">{avg_volume/1000:.1f}K</div>
-                    <div class="metric-label">Avg Daily</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Chart Type Selection
-        chart_type = st.radio(
-            "Chart Type",
-            ["Candle", "Line", "Area"],
-            horizontal=True,
-            label_visibility="collapsed"
-        )
-        
-        # Main OHLC Chart
-        st.markdown('<div class="chart-title">📈 OHLC Candlestick Chart</div>', unsafe_allow_html=True)
-        
-        fig = go.Figure()
-        
-        if chart_type == "Candle":
-            fig.add_trace(go.Candlestick(
-                x=df['date'],
-                open=df['open'],
-                high=df['high'],
-                low=df['low'],
-                close=df['close'],
-                increasing_line_color='#10b981',
-                decreasing_line_color='#f87171'
-            ))
-        elif chart_type == "Area":
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['close'],
-                mode='lines',
-                fill='tozeroy',
-                fillcolor='rgba(45,212,191,0.15)',
-                line=dict(color='#2dd4bf', width=2.5)
-            ))
-        else:  # Line
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['close'],
-                mode='lines',
-                line=dict(color='#2dd4bf', width=2.5, shape='spline')
-            ))
-        
-        fig.update_layout(**get_plotly_layout(), height=360)
-        st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
-        
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Bottom Row: Volume + Returns
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown('<div class="chart-title">📊 Trading Volume Analysis</div>', unsafe_allow_html=True)
+            # Data Source
+            st.markdown('<div class="form-label">📂 Data Source</div>', unsafe_allow_html=True)
+            data_source = st.radio(
+                "Data Source",
+                ["Simulated", "Upload CSV", "Local File"],
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+            dataset_upload = None
+            dataset_file = None
+            if data_source == "Upload CSV":
+                dataset_upload = st.file_uploader(
+                    "OHLCV CSV",
+                    type="csv",
+                    help="Timestamp, Open, High, Low, Close, Volume columns, oldest bar first"
+                )
+            elif data_source == "Local File":
+                local_files = local_datasets()
+                if local_files:
+                    dataset_file = st.selectbox("Dataset", local_files, format_func=os.path.basename)
+                else:
+                    st.caption(f"No CSV files in {data_dir()}")
             
-            volume_colors = ['rgba(16,185,129,0.7)' if i > 0 and df.iloc[i]['close'] > df.iloc[i-1]['close'] 
-                           else 'rgba(248,113,113,0.7)' for i in range(len(df))]
+            # Real dataset: converted to the columnar cache on first use, then
+            # viewed one date range and resolution at a time
+            dataset_view = None
+            if dataset_upload is not None or dataset_file is not None:
+                try:
+                    with timed('ingest_dataset'):
+                        dataset = ingest_dataset(dataset_upload, dataset_file)
+                    info = load_dataset_info(dataset)
+                except ValueError as e:
+                    st.error(f"Could not load dataset: {e}")
+                else:
+                    date_range = st.date_input(
+                        "Date range",
+                        value=(info['first'].date(), info['last'].date()),
+                        min_value=info['first'].date(),
+                        max_value=info['last'].date()
+                    )
+                    range_start = pd.Timestamp(date_range[0])
+                    range_end = pd.Timestamp(date_range[-1]) + pd.Timedelta(days=1)
+                    resolution = st.radio(
+                        "Resolution",
+                        dataset_intervals(info['interval'], range_start, range_end),
+                        horizontal=True,
+                        help=f"Intervals that keep the range under {DATASET_MAX_BARS:,} bars; narrow the range for finer bars"
+                    )
+                    # Bars are only passed through as they are if they are already at resolution
+                    native = resolution == info['interval'] and info['exact']
+                    dataset_view = (dataset, range_start, range_end, None if native else resolution)
+                    dataset_caption = st.empty()
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            fig_vol = go.Figure()
-            fig_vol.add_trace(go.Bar(
-                x=df['date'],
-                y=df['volume'],
-                marker_color=volume_colors
-            ))
+            # Price Pattern
+            st.markdown('<div class="form-label">📊 Price Pattern</div>', unsafe_allow_html=True)
+            pattern = st.selectbox(
+                "Price Pattern",
+                ["Sine Wave (Smooth Cycles)", "Cosine Wave (Phase Shift)", "Combined Waves", "Realistic Behavior"],
+                index=list(WAVE_PATTERNS).index(DEFAULT_ASSET['pattern']),
+                label_visibility="collapsed"
+            )
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            layout = get_plotly_layout()
-            layout['yaxis'] = {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)', 'title': {'text': 'Volume'}}
-            fig_vol.update_layout(**layout, height=280)
-            st.plotly_chart(fig_vol, width="stretch", config={'displayModeBar': False})
-        
-        with col2:
-            st.markdown('<div class="chart-title">📉 Daily Returns Volatility</div>', unsafe_allow_html=True)
+            # Amplitude
+            st.markdown('<div class="form-label">💰 Amplitude ($)</div>', unsafe_allow_html=True)
+            amplitude = st.slider(
+                "Amplitude ($)",
+                min_value=500,
+                max_value=15000,
+                value=DEFAULT_ASSET['amplitude'],
+                step=100,
+                help="Low Swing ← → High Swing",
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${amplitude:,}</div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            returns = df['close'].pct_change() * 100
-            returns = returns.dropna()
-            ret_colors = ['rgba(16,185,129,0.7)' if r >= 0 else 'rgba(248,113,113,0.7)' for r in returns]
+            # Frequency
+            st.markdown('<div class="form-label">⚡ Frequency (Speed)</div>', unsafe_allow_html=True)
+            frequency = st.slider(
+                "Frequency (Speed)",
+                min_value=1,
+                max_value=20,
+                value=DEFAULT_ASSET['frequency'],
+                step=1,
+                help="Slow ← → Fast",
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">{frequency}</div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            fig_ret = go.Figure()
-            fig_ret.add_trace(go.Bar(
-                x=df['date'][1:],
-                y=returns,
-                marker_color=ret_colors
-            ))
+            # Drift
+            st.markdown('<div class="form-label">📈 Drift (Trend)</div>', unsafe_allow_html=True)
+            drift = st.slider(
+                "Drift (Trend)",
+                min_value=-200,
+                max_value=200,
+                value=DEFAULT_ASSET['drift'],
+                step=10,
+                help="Downtrend ← → Uptrend",
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">{drift}</div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            layout = get_plotly_layout()
-            layout['yaxis'] = {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)', 
-                              'ticksuffix': '%', 'title': {'text': 'Daily Return %'}}
-            fig_ret.update_layout(**layout, height=280)
-            st.plotly_chart(fig_ret, width="stretch", config={'displayModeBar': False})
-    
-    # Analysis Tab
-    with tab2:
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown('<div class="chart-title">📊 High vs Low Price Comparison</div>', unsafe_allow_html=True)
+            # Noise
+            st.markdown('<div class="form-label">🎲 Noise (Randomness)</div>', unsafe_allow_html=True)
+            noise = st.slider(
+                "Noise (Randomness)",
+                min_value=0,
+                max_value=8000,
+                value=DEFAULT_ASSET['noise'],
+                step=100,
+                help="None ← → Max",
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${noise:,}</div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            fig_hl = go.Figure()
-            fig_hl.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['high'],
-                mode='lines',
-                name='High',
-                line=dict(color='#10b981', width=2)
-            ))
-            fig_hl.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['low'],
-                mode='lines',
-                name='Low',
-                line=dict(color='#f87171', width=2),
-                fill='tonexty',
-                fillcolor='rgba(45,212,191,0.1)'
-            ))
+            # Base Price
+            st.markdown('<div class="form-label">💵 Base Price ($)</div>', unsafe_allow_html=True)
+            base_price = st.slider(
+                "Base Price ($)",
+                min_value=10000,
+                max_value=100000,
+                value=DEFAULT_ASSET['base'],
+                step=1000,
+                help="10k ← → 100k",
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">${base_price:,}</div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            layout = get_plotly_layout()
-            layout['showlegend'] = True
-            layout['legend'] = {'x': 0, 'y': 1.1, 'orientation': 'h'}
-            fig_hl.update_layout(**layout, height=380)
-            st.plotly_chart(fig_hl, width="stretch", config={'displayModeBar': False})
-        
-        with col2:
-            st.markdown('<div class="chart-title">📈 Volatility Metrics</div>', unsafe_allow_html=True)
+            # Horizon & Bar Interval
+            st.markdown('<div class="form-label">🗓️ Horizon (Days)</div>', unsafe_allow_html=True)
+            days = st.select_slider(
+                "Horizon (Days)",
+                options=[30, 90, 180, 365, 730],
+                value=DEFAULT_ASSET['days'],
+                label_visibility="collapsed"
+            )
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            max_price = df['close'].max()
-            min_price = df['close'].min()
-            avg_daily_change = returns.mean()
-            sharpe = (avg_daily_change / (std_dev / np.sqrt(len(df['close'])))) if std_dev != 0 else 0
+            st.markdown('<div class="form-label">⏱️ Bar Interval</div>', unsafe_allow_html=True)
+            interval = st.radio(
+                "Bar Interval",
+                list(BAR_INTERVALS),
+                index=list(BAR_INTERVALS).index(DEFAULT_ASSET['interval']),
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+            st.markdown(f'<div style="text-align: center; color: #2dd4bf; font-weight: 600; margin-top: 5px;">{bar_count(days, interval):,} bars</div>', unsafe_allow_html=True)
+            full_resolution = st.toggle(
+                "Full-resolution charts",
+                value=False,
+                help=f"Off: line charts are downsampled to {MAX_CHART_POINTS:,} points per trace, keeping peaks and troughs"
+            )
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            vol_level = "HIGH" if std_dev > 2000 else "LOW"
-            vol_class = "volatility-high" if vol_level == "HIGH" else "volatility-low"
+            # Random Seed
+            st.markdown('<div class="form-label">🎯 Random Seed</div>', unsafe_allow_html=True)
+            seed = st.number_input(
+                "Random Seed",
+                min_value=0,
+                max_value=2**32 - 1,
+                step=1,
+                key="seed",
+                help="Same seed + same parameters = same data",
+                label_visibility="collapsed"
+            )
+            st.button("🎲 New Seed", width="stretch",
+                      on_click=lambda: st.session_state.update(seed=new_seed()))
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
             
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Max Price</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">${int(max_price):,}</div>
-                </div>
-                <div class="spacer"></div>
-                <div class="metric-card">
-                    <div class="metric-title">Min Price</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">${int(min_price):,}</div>
-                </div>
-                <div class="spacer"></div>
-                <div class="metric-card">
-                    <div class="metric-title">Volatility Level</div>
-                    <div style="margin-top: 10px;"><span class="{vol_class}">{vol_level}</span></div>
-                </div>
-                <div class="spacer"></div>
-                <div class="metric-card">
-                    <div class="metric-title">Avg Daily Change</div>
-                    <div class="metric-value" style="font-size: 1.4rem; color: {'#10b981' if avg_daily_change >= 0 else '#f87171'}">
-                        {'+' if avg_daily_change >= 0 else ''}{avg_daily_change:.2f}%
-                    </div>
-                </div>
-                <div class="spacer"></div>
-                <div class="metric-card">
-                    <div class="metric-title">Sharpe Ratio</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">{sharpe:.2f}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('<div class="spacer-lg"></div>', unsafe_allow_html=True)
-        
-        # Histogram
-        st.markdown('<div class="chart-title">📊 Price Distribution & Density</div>', unsafe_allow_html=True)
-        
-        fig_hist = go.Figure()
-        fig_hist.add_trace(go.Histogram(
-            x=df['close'],
-            nbinsx=25,
-            marker=dict(
-                color='rgba(139,92,246,0.6)',
-                line=dict(color='rgba(139,92,246,0.9)', width=1)
+            # Monte Carlo Ensemble
+            st.markdown('<div class="form-label">🎰 Monte Carlo Ensemble</div>', unsafe_allow_html=True)
+            ensemble_on = st.toggle("Simulate many paths", value=False)
+            n_paths = st.select_slider(
+                "Paths",
+                options=[100, 500, 1000, 5000, 10000],
+                value=1000,
+                disabled=not ensemble_on,
+                label_visibility="collapsed"
             )
-        ))
-        
-        layout = get_plotly_layout()
-        layout['xaxis']['tickprefix'] = '$'
-        layout['yaxis'] = {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)', 'title': {'text': 'Frequency'}}
-        fig_hist.update_layout(**layout, height=300)
-        st.plotly_chart(fig_hist, width="stretch", config={'displayModeBar': False})
-    
-    # Comparison Tab
-    with tab3:
-        st.markdown('<div class="chart-title">⚖️ Stable vs Volatile Asset Comparison</div>', unsafe_allow_html=True)
-        st.markdown('<div style="text-align: center; color: #94a3b8; margin-bottom: 20px;">Side-by-side analysis of low-volatility vs high-volatility market behavior</div>', unsafe_allow_html=True)
-        
-        # Generate comparison data
-        days_comp = 180
-        stable_dates, stable_prices = simulate_price(days_comp, base_price, 500, 2, 20, 200, 'Sine Wave (Smooth Cycles)')
-        volatile_dates, volatile_prices = simulate_price(days_comp, base_price, 8000, 5, 30, 5000, 'Realistic Behavior')
-        
-        fig_comp = go.Figure()
-        
-        fig_comp.add_trace(go.Scatter(
-            x=stable_dates,
-            y=stable_prices,
-            mode='lines',
-            name='Stable Asset',
-            line=dict(color='#10b981', width=2.5)
-        ))
-        
-        fig_comp.add_trace(go.Scatter(
-            x=volatile_dates,
-            y=volatile_prices,
-            mode='lines',
-            name='Volatile Asset',
-            line=dict(color='#f87171', width=2.5)
-        ))
-        
-        layout = get_plotly_layout()
-        layout['showlegend'] = True
-        layout['legend'] = {'x': 0, 'y': 1.1, 'orientation': 'h', 'bgcolor': 'rgba(0,0,0,0.3)'}
-        fig_comp.update_layout(**layout, height=400)
-        st.plotly_chart(fig_comp, width="stretch", config={'displayModeBar': False})
-        
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+            
+            # Live Mode
+            st.markdown('<div class="form-label">📡 Live Mode</div>', unsafe_allow_html=True)
+            live_on = st.toggle("Stream new bars", key="live_on")
+            live_source = st.radio(
+                "Live Feed",
+                ["Simulator", "Replay CSV"],
+                horizontal=True,
+                disabled=not live_on,
+                label_visibility="collapsed"
+            )
+            live_rate = st.slider("Bars / second", min_value=1, max_value=50, value=5, disabled=not live_on)
+            replay_upload = None
+            if live_on and live_source == "Replay CSV":
+                replay_upload = st.file_uploader(
+                    "OHLCV CSV to replay",
+                    type="csv",
+                    help="Timestamp, Open, High, Low, Close, Volume columns in any order — defaults to the current dataset"
+                )
         
-        # Metrics
-        col1, col2 = st.columns(2)
+        # Generate Data (on a cold process, the defaults may still be precomputing).
+        # view_interval is the bar size of df; interval stays the sidebar's, which
+        # the Compare, Portfolio and live simulations use even while a dataset is shown
+        warm_start().join()
+        with timed('load_asset'):
+            if dataset_view is None:
+                df = load_asset(days, base_price, amplitude, frequency, drift, noise, pattern, seed, RNG_STREAMS['main'], interval)
+                view_interval = interval
+            else:
+                df = load_dataset_frame(*dataset_view)
+                view_interval = resolution
+                dataset_caption.caption(f"📂 {len(df):,} of {info['rows']:,} bars in file · {view_interval}")
+                if df.empty:
+                    st.warning("No bars in the selected date range")
+                    st.stop()
+        bar_label = 'Daily' if view_interval == '1d' else f'{view_interval} Bar'
+        st.session_state.generated_data = df
         
-        stable_std = np.std(stable_prices)
-        stable_swing = max(stable_prices) - min(stable_prices)
-        stable_return = ((stable_prices[-1] - stable_prices[0]) / stable_prices[0]) * 100
+        # Live Feed: (re)connect when the source or parameters change
+        with timed('live_feed'):
+            if live_on:
+                live_key = (live_source, live_rate, days, base_price, amplitude, frequency, drift, noise, pattern, interval, seed,
+                            dataset_view, replay_upload.file_id if replay_upload is not None else None)
+                live = st.session_state.get('live')
+                if live is None or live['key'] != live_key:
+                    if live is not None:
+                        live['feed'].close()
+                    buffer = OHLCVRingBuffer()
+                    live_stats = PriceStats()
+                    if live_source == "Simulator":
+                        buffer.append(df)
+                        live_stats.update_frame(df)
+                        feed = SimulatedFeed(df, days, base_price, amplitude, frequency, drift, noise, pattern, interval,
+                                             make_rng(seed, RNG_STREAMS['live']), live_rate)
+                    else:
+                        data = replay_upload.getvalue() if replay_upload is not None else export_ohlcv(df, 'CSV', view_interval).getvalue()
+                        server = get_replay_server(replay_file(data), live_rate)
+                        try:
+                            feed = ReplayFeed(server, get_event_loop())
+                        except ValueError as e:
+                            st.error(f"Could not replay CSV: {e}")
+                            feed = None
+                    if feed is None:
+                        st.session_state.live = None
+                        live_on = False
+                    else:
+                        st.session_state.live = {'key': live_key, 'buffer': buffer, 'feed': feed, 'stats': live_stats, 'received': 0}
+            elif st.session_state.get('live') is not None:
+                st.session_state.live['feed'].close()
+                st.session_state.live = None
         
-        volatile_std = np.std(volatile_prices)
-        volatile_swing = max(volatile_prices) - min(volatile_prices)
-        volatile_return = ((volatile_prices[-1] - volatile_prices[0]) / volatile_prices[0]) * 100
+        # Calculate Metrics
+        with timed('metrics'):
+            if dataset_view is None:
+                stats = load_asset_stats(days, base_price, amplitude, frequency, drift, noise, pattern, seed, RNG_STREAMS['main'], interval)
+            else:
+                stats = load_dataset_stats(*dataset_view)
+        last_price = stats.last
+        mean_price = stats.close.mean
+        std_dev = stats.close.std
+        avg_range = stats.range.mean
+        avg_volume = stats.volume.mean
         
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card" style="border-color: rgba(16,185,129,0.3);">
-                    <div style="font-size: 1.3rem; font-weight: 700; color: #10b981; margin-bottom: 20px;">
-                        🟢 Stable Asset (Low Volatility)
+        # Dashboard Tab
+        if tab1.open:
+            with tab1:
+                if live_on:
+                    with timed('live_panel'):
+                        live_panel(full_resolution)
+                    st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Metrics Row
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Current Price</div>
+                        <div class="metric-value">${int(last_price):,}</div>
+                        <div class="metric-label">Close</div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Amplitude</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">$500</div>
+                """, unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Volatility (σ)</div>
+                        <div class="metric-value">${int(std_dev):,}</div>
+                        <div class="metric-label">Std Dev</div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Std Dev</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">${int(stable_std):,}</div>
+                """, unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">{bar_label} Range</div>
+                        <div class="metric-value">${int(avg_range):,}</div>
+                        <div class="metric-label">Avg H-L</div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Max Swing</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">${int(stable_swing):,}</div>
+                """, unsafe_allow_html=True)
+                
+                with col4:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Trading Volume</div>
+                        <div class="metric-value">{avg_volume/1000:.1f}K</div>
+                        <div class="metric-label">Avg {bar_label}</div>
                     </div>
-                    <div>
-                        <div class="metric-title">Total Return</div>
-                        <div class="metric-value" style="font-size: 1.3rem; color: {'#10b981' if stable_return >= 0 else '#f87171'}">
-                            {'+' if stable_return >= 0 else ''}{stable_return:.2f}%
+                """, unsafe_allow_html=True)
+                
+                st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Chart Type Selection
+                chart_type = st.radio(
+                    "Chart Type",
+                    ["Candle", "Line", "Area"],
+                    horizontal=True,
+                    label_visibility="collapsed",
+                    key="chart_type"
+                )
+                
+                # Main OHLC Chart
+                st.markdown('<div class="chart-title">📈 OHLC Candlestick Chart</div>', unsafe_allow_html=True)
+                
+                with timed('figure.ohlc'):
+                    fig = new_figure(height=360)
+                    
+                    if chart_type == "Candle":
+                        candles = df if full_resolution else resample_ohlcv(df, MAX_CANDLES)
+                        fig.add_trace(go.Candlestick(
+                            x=candles['date'],
+                            open=candles['open'],
+                            high=candles['high'],
+                            low=candles['low'],
+                            close=candles['close'],
+                            increasing_line_color='#10b981',
+                            decreasing_line_color='#f87171'
+                        ))
+                    elif chart_type == "Area":
+                        close_x, close_y = chart_points(df['date'], df['close'], full_resolution)
+                        fig.add_trace(line_trace(len(close_y))(
+                            x=close_x,
+                            y=close_y,
+                            mode='lines',
+                            fill='tozeroy',
+                            fillcolor='rgba(45,212,191,0.15)',
+                            line=dict(color='#2dd4bf', width=2.5)
+                        ))
+                    else:  # Line
+                        close_x, close_y = chart_points(df['date'], df['close'], full_resolution)
+                        fig.add_trace(line_trace(len(close_y))(
+                            x=close_x,
+                            y=close_y,
+                            mode='lines',
+                            line=dict(color='#2dd4bf', width=2.5,
+                                      shape='spline' if len(close_y) <= MAX_CHART_POINTS else 'linear')
+                        ))
+                    
+                    st.plotly_chart(compact_figure(fig), width="stretch", config={'displayModeBar': False})
+                
+                st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Monte Carlo Fan Chart
+                if ensemble_on:
+                    with timed('ensemble'):
+                        bands, path_stats = load_ensemble(n_paths, days, base_price, amplitude, frequency, drift, noise, pattern,
+                                                          seed, RNG_STREAMS['ensemble'])
+                    
+                    st.markdown(f'<div class="chart-title">🎰 Monte Carlo Fan Chart ({n_paths:,} paths)</div>', unsafe_allow_html=True)
+                    
+                    with timed('figure.fan'):
+                        fig_fan = new_figure(height=340)
+                        for lo, hi, fill in [('p5', 'p95', 'rgba(139,92,246,0.15)'), ('p25', 'p75', 'rgba(139,92,246,0.3)')]:
+                            fig_fan.add_trace(go.Scatter(
+                                x=bands['date'],
+                                y=bands[hi],
+                                mode='lines',
+                                line=dict(width=0),
+                                hoverinfo='skip'
+                            ))
+                            fig_fan.add_trace(go.Scatter(
+                                x=bands['date'],
+                                y=bands[lo],
+                                mode='lines',
+                                line=dict(width=0),
+                                fill='tonexty',
+                                fillcolor=fill,
+                                hoverinfo='skip'
+                            ))
+                        fig_fan.add_trace(go.Scatter(
+                            x=bands['date'],
+                            y=bands['p50'],
+                            mode='lines',
+                            name='Median',
+                            line=dict(color='#8b5cf6', width=2.5)
+                        ))
+                        
+                        st.plotly_chart(compact_figure(fig_fan), width="stretch", config={'displayModeBar': False})
+                    
+                    final_lo, final_mid, final_hi = np.percentile(path_stats['final_price'], [5, 50, 95])
+                    
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.markdown(f"""
+                        <div class="metric-card">
+                            <div class="metric-title">Median Final Price</div>
+                            <div class="metric-value">${int(final_mid):,}</div>
+                            <div class="metric-label">P50</div>
                         </div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown(f"""
+                        <div class="metric-card">
+                            <div class="metric-title">Final Price Range</div>
+                            <div class="metric-value">${int(final_lo):,} – ${int(final_hi):,}</div>
+                            <div class="metric-label">P5 – P95</div>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown(f"""
+                        <div class="metric-card">
+                            <div class="metric-title">Avg Path Volatility</div>
+                            <div class="metric-value">${int(path_stats['std'].mean()):,}</div>
+                            <div class="metric-label">Mean σ · Avg Swing ${int(path_stats['swing'].mean()):,}</div>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    
+                    st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Volume and returns share one time axis, so zooming one zooms both
+                st.markdown(f'<div class="chart-title">📊 Trading Volume & {bar_label} Returns Volatility</div>', unsafe_allow_html=True)
+                
+                with timed('figure.volume_returns'):
+                    vol_bars = df if full_resolution else resample_ohlcv(df, MAX_CHART_POINTS)
+                    volume_colors = (vol_bars['close'].diff() > 0).to_numpy(dtype=np.int8)
+                    
+                    returns = df['close'].pct_change() * 100
+                    returns = returns.dropna()
+                    if full_resolution:
+                        ret_x, ret_y = df['date'][1:], returns.to_numpy()
+                    else:
+                        ret_x, ret_y = extreme_bars(df['date'][1:], returns, MAX_CHART_POINTS)
+                    ret_colors = (ret_y >= 0).astype(np.int8)
+                    
+                    fig_bars = new_figure(
+                        height=460,
+                        yaxis={'tickprefix': '', 'title': {'text': 'Volume'}},
+                        yaxis2={'tickprefix': '', 'ticksuffix': '%', 'title': {'text': f'{bar_label} Return %'}}
+                    )
+                    fig_bars.set_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.06)
+                    fig_bars.add_trace(go.Bar(
+                        x=vol_bars['date'],
+                        y=vol_bars['volume'],
+                        name='Volume',
+                        marker=dict(color=volume_colors, colorscale=UP_DOWN_COLORSCALE, cmin=0, cmax=1)
+                    ), row=1, col=1)
+                    fig_bars.add_trace(go.Bar(
+                        x=ret_x,
+                        y=ret_y,
+                        name='Return',
+                        marker=dict(color=ret_colors, colorscale=UP_DOWN_COLORSCALE, cmin=0, cmax=1)
+                    ), row=2, col=1)
+                    st.plotly_chart(compact_figure(fig_bars), width="stretch", config={'displayModeBar': False})
         
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card" style="border-color: rgba(248,113,113,0.3);">
-                    <div style="font-size: 1.3rem; font-weight: 700; color: #f87171; margin-bottom: 20px;">
-                        🔴 Volatile Asset (High Volatility)
+        # Analysis Tab
+        if tab2.open:
+            with tab2:
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    st.markdown('<div class="chart-title">📊 High vs Low Price Comparison</div>', unsafe_allow_html=True)
+                    
+                    with timed('figure.high_low'):
+                        high_x, high_y = chart_points(df['date'], df['high'], full_resolution)
+                        low_x, low_y = chart_points(df['date'], df['low'], full_resolution)
+                        
+                        fig_hl = new_figure(height=380, showlegend=True, legend={'x': 0, 'y': 1.1, 'orientation': 'h'})
+                        fig_hl.add_trace(go.Scatter(
+                            x=high_x,
+                            y=high_y,
+                            mode='lines',
+                            name='High',
+                            line=dict(color='#10b981', width=2)
+                        ))
+                        fig_hl.add_trace(go.Scatter(
+                            x=low_x,
+                            y=low_y,
+                            mode='lines',
+                            name='Low',
+                            line=dict(color='#f87171', width=2),
+                            fill='tonexty',
+                            fillcolor='rgba(45,212,191,0.1)'
+                        ))
+                        
+                        st.plotly_chart(compact_figure(fig_hl), width="stretch", config={'displayModeBar': False})
+                
+                with col2:
+                    st.markdown('<div class="chart-title">📈 Volatility Metrics</div>', unsafe_allow_html=True)
+                    
+                    max_price = stats.close.max
+                    min_price = stats.close.min
+                    avg_daily_change = stats.returns.mean
+                    sharpe = (avg_daily_change / (std_dev / np.sqrt(stats.close.count))) if std_dev != 0 else 0
+                    
+                    vol_level = "HIGH" if std_dev > 2000 else "LOW"
+                    vol_class = "volatility-high" if vol_level == "HIGH" else "volatility-low"
+                    
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Max Price</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">${int(max_price):,}</div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Amplitude</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">$8,000</div>
+                    <div class="spacer"></div>
+                    <div class="metric-card">
+                        <div class="metric-title">Min Price</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">${int(min_price):,}</div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Std Dev</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">${int(volatile_std):,}</div>
+                    <div class="spacer"></div>
+                    <div class="metric-card">
+                        <div class="metric-title">Volatility Level</div>
+                        <div style="margin-top: 10px;"><span class="{vol_class}">{vol_level}</span></div>
                     </div>
-                    <div style="margin-bottom: 12px;">
-                        <div class="metric-title">Max Swing</div>
-                        <div class="metric-value" style="font-size: 1.3rem;">${int(volatile_swing):,}</div>
+                    <div class="spacer"></div>
+                    <div class="metric-card">
+                        <div class="metric-title">Avg {bar_label} Change</div>
+                        <div class="metric-value" style="font-size: 1.4rem; color: {'#10b981' if avg_daily_change >= 0 else '#f87171'}">
+                            {'+' if avg_daily_change >= 0 else ''}{avg_daily_change:.2f}%
+                        </div>
                     </div>
-                    <div>
-                        <div class="metric-title">Total Return</div>
-                        <div class="metric-value" style="font-size: 1.3rem; color: {'#10b981' if volatile_return >= 0 else '#f87171'}">
-                            {'+' if volatile_return >= 0 else ''}{volatile_return:.2f}%
+                    <div class="spacer"></div>
+                    <div class="metric-card">
+                        <div class="metric-title">Sharpe Ratio</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">{sharpe:.2f}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                st.markdown('<div class="spacer-lg"></div>', unsafe_allow_html=True)
+                
+                # Rolling Volatility Estimators
+                title_col, window_col = st.columns([3, 1])
+                with title_col:
+                    st.markdown('<div class="chart-title">📉 Rolling Volatility Estimators (annualised)</div>', unsafe_allow_html=True)
+                with window_col:
+                    vol_window = st.slider("Rolling window (bars)", min_value=5, max_value=200, value=20, step=5, key="vol_window")
+                
+                with timed('rolling_volatility'):
+                    vol_df = rolling_volatility(df, vol_window, view_interval)
+                with timed('figure.volatility'):
+                    vol_colors = ['#2dd4bf', '#8b5cf6', '#10b981', '#f59e0b', '#f87171']
+                    
+                    fig_vol_est = new_figure(
+                        height=360,
+                        showlegend=True,
+                        legend={'x': 0, 'y': 1.15, 'orientation': 'h'},
+                        yaxis={'tickprefix': '', 'ticksuffix': '%', 'title': {'text': 'Annualised σ'}},
+                        yaxis2={'overlaying': 'y', 'side': 'right', 'showgrid': False, 'title': {'text': 'ATR'}},
+                        margin={'l': 50, 'r': 60, 't': 10, 'b': 40}
+                    )
+                    for (column, label), color in zip(VOLATILITY_ESTIMATORS.items(), vol_colors):
+                        est_x, est_y = chart_points(vol_df['date'], vol_df[column], full_resolution)
+                        fig_vol_est.add_trace(line_trace(len(est_y))(
+                            x=est_x,
+                            y=est_y,
+                            mode='lines',
+                            name=label,
+                            line=dict(color=color, width=1.8)
+                        ))
+                    atr_x, atr_y = chart_points(vol_df['date'], vol_df['atr'], full_resolution)
+                    fig_vol_est.add_trace(line_trace(len(atr_y))(
+                        x=atr_x,
+                        y=atr_y,
+                        mode='lines',
+                        name='ATR ($)',
+                        yaxis='y2',
+                        line=dict(color='rgba(148,163,184,0.8)', width=1.5, dash='dot')
+                    ))
+                    
+                    st.plotly_chart(compact_figure(fig_vol_est), width="stretch", config={'displayModeBar': False})
+                
+                st.markdown('<div class="spacer-lg"></div>', unsafe_allow_html=True)
+                
+                # Histogram
+                st.markdown('<div class="chart-title">📊 Price Distribution & Density</div>', unsafe_allow_html=True)
+                
+                # Bin on the server so only 25 bars are sent, however long the series
+                with timed('figure.histogram'):
+                    counts, edges = np.histogram(df['close'], bins=25)
+                    
+                    fig_hist = new_figure(
+                        height=300,
+                        xaxis={'tickprefix': '$'},
+                        yaxis={'tickprefix': '', 'title': {'text': 'Frequency'}}
+                    )
+                    fig_hist.add_trace(go.Bar(
+                        x=(edges[:-1] + edges[1:]) / 2,
+                        y=counts,
+                        width=np.diff(edges),
+                        marker=dict(
+                            color='rgba(139,92,246,0.6)',
+                            line=dict(color='rgba(139,92,246,0.9)', width=1)
+                        )
+                    ))
+                    
+                    st.plotly_chart(compact_figure(fig_hist), width="stretch", config={'displayModeBar': False})
+                
+                st.markdown('<div class="spacer-lg"></div>', unsafe_allow_html=True)
+                
+                # Parameter Sensitivity Sweep
+                st.markdown('<div class="chart-title">🧪 Parameter Sensitivity Sweep</div>', unsafe_allow_html=True)
+                sweep_on = st.toggle("Run sweep over amplitude × noise × frequency", value=False, key="sweep_on")
+                
+                if sweep_on:
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        amp_range = st.slider("Amplitude range ($)", 500, 15000, (500, 15000), step=100, key="sweep_amp_range")
+                        n_amp = st.number_input("Amplitude steps", min_value=2, max_value=100, value=50, key="sweep_n_amp")
+                    with col2:
+                        noise_range = st.slider("Noise range ($)", 0, 8000, (0, 8000), step=100, key="sweep_noise_range")
+                        n_noise = st.number_input("Noise steps", min_value=2, max_value=100, value=50, key="sweep_n_noise")
+                    with col3:
+                        freq_range = st.slider("Frequency range", 1, 20, (1, 20), key="sweep_freq_range")
+                        n_freq = st.number_input("Frequency steps", min_value=1, max_value=50, value=20, key="sweep_n_freq")
+                    with col4:
+                        sweep_metric = st.radio("Metric", list(SWEEP_METRICS), format_func=SWEEP_METRICS.get, key="sweep_metric")
+                    
+                    sweep_amps = np.linspace(*amp_range, int(n_amp)).round(2)
+                    sweep_noises = np.linspace(*noise_range, int(n_noise)).round(2)
+                    sweep_freqs = np.linspace(*freq_range, int(n_freq)).round(2)
+                    
+                    # The sweep runs on daily bars over the sidebar horizon, pattern, drift and base
+                    with timed('sweep'):
+                        sweep = load_sweep(days, base_price, drift, pattern, sweep_amps, sweep_noises, sweep_freqs, seed)
+                    
+                    freq_value = st.select_slider("Frequency slice", options=list(sweep_freqs))
+                    freq_idx = list(sweep_freqs).index(freq_value)
+                    
+                    with timed('figure.sweep'):
+                        fig_sweep = new_figure(
+                            go.Heatmap(
+                                z=sweep[sweep_metric][:, :, freq_idx],
+                                x=sweep_noises,
+                                y=sweep_amps,
+                                colorscale=[[0, '#1a1f2e'], [0.5, '#8b5cf6'], [1, '#2dd4bf']],
+                                colorbar=dict(title=dict(text=SWEEP_METRICS[sweep_metric]))
+                            ),
+                            height=420,
+                            hovermode='closest',
+                            xaxis={'title': {'text': 'Noise ($)'}, 'tickprefix': '$'},
+                            yaxis={'title': {'text': 'Amplitude ($)'}}
+                        )
+                        st.plotly_chart(compact_figure(fig_sweep), width="stretch", config={'displayModeBar': False})
+                    st.markdown(f'<div style="color: #94a3b8; font-size: 0.85rem;">{sweep_amps.size * sweep_noises.size * sweep_freqs.size:,} parameter combinations × {days} daily bars, sharing one noise draw</div>', unsafe_allow_html=True)
+        
+        # Comparison Tab
+        if tab3.open:
+            with tab3:
+                st.markdown('<div class="chart-title">⚖️ Scenario Comparison</div>', unsafe_allow_html=True)
+                st.markdown('<div style="text-align: center; color: #94a3b8; margin-bottom: 20px;">Define any number of market scenarios and compare their behavior side by side</div>', unsafe_allow_html=True)
+                
+                # Scenario definitions (base price, horizon, interval and seed come from the sidebar).
+                # The editor's edits are dropped while another view is open, so it restarts
+                # from the last edited table when reopened
+                if 'scenarios' not in st.session_state:
+                    st.session_state.scenario_base = st.session_state.get('scenario_table', DEFAULT_SCENARIOS)
+                scenarios = st.data_editor(
+                    st.session_state.scenario_base,
+                    num_rows="dynamic",
+                    width="stretch",
+                    hide_index=True,
+                    key="scenarios",
+                    column_config={
+                        'name': st.column_config.TextColumn("Scenario", required=True),
+                        'pattern': st.column_config.SelectboxColumn("Pattern", options=list(WAVE_PATTERNS), required=True),
+                        'amplitude': st.column_config.NumberColumn("Amplitude ($)", min_value=0, max_value=15000, step=100, required=True),
+                        'frequency': st.column_config.NumberColumn("Frequency", min_value=1, max_value=20, step=1, required=True),
+                        'drift': st.column_config.NumberColumn("Drift", min_value=-200, max_value=200, step=10, required=True),
+                        'noise': st.column_config.NumberColumn("Noise ($)", min_value=0, max_value=8000, step=100, required=True)
+                    }
+                )
+                st.session_state.scenario_table = scenarios
+                scenarios = scenarios.dropna().reset_index(drop=True)
+                
+                # Simulate every scenario (misses run in the shared process pool)
+                specs = [
+                    (days, base_price, row.amplitude, row.frequency, row.drift, row.noise, row.pattern,
+                     seed, (RNG_STREAMS['compare'], k), interval)
+                    for k, row in enumerate(scenarios.itertuples(index=False))
+                ]
+                with timed('compare.simulate'):
+                    results = load_scenarios(specs)
+                
+                with timed('figure.compare'):
+                    fig_comp = new_figure(
+                        height=400,
+                        showlegend=True,
+                        legend={'x': 0, 'y': 1.1, 'orientation': 'h', 'bgcolor': 'rgba(0,0,0,0.3)'}
+                    )
+                    
+                    for k, (row, (scenario_df, _)) in enumerate(zip(scenarios.itertuples(index=False), results)):
+                        comp_x, comp_y = chart_points(scenario_df['date'], scenario_df['close'], full_resolution)
+                        fig_comp.add_trace(line_trace(len(comp_y))(
+                            x=comp_x,
+                            y=comp_y,
+                            mode='lines',
+                            name=row.name,
+                            line=dict(color=SCENARIO_COLORS[k % len(SCENARIO_COLORS)], width=2.5)
+                        ))
+                    
+                    st.plotly_chart(compact_figure(fig_comp), width="stretch", config={'displayModeBar': False})
+                
+                st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Metrics: one card per scenario, up to four per row
+                for row_start in range(0, len(scenarios), 4):
+                    cols = st.columns(4)
+                    for col, k in zip(cols, range(row_start, min(row_start + 4, len(scenarios)))):
+                        row = scenarios.iloc[k]
+                        scenario_stats = results[k][1]
+                        color = SCENARIO_COLORS[k % len(SCENARIO_COLORS)]
+                        scenario_return = scenario_stats.total_return
+                        with col:
+                            st.markdown(f"""
+                            <div class="metric-card" style="border-color: {color}55; margin-bottom: 16px;">
+                                <div style="font-size: 1.3rem; font-weight: 700; color: {color}; margin-bottom: 20px;">
+                                    {row['name']}
+                                </div>
+                                <div style="margin-bottom: 12px;">
+                                    <div class="metric-title">Amplitude</div>
+                                    <div class="metric-value" style="font-size: 1.3rem;">${int(row['amplitude']):,}</div>
+                                </div>
+                                <div style="margin-bottom: 12px;">
+                                    <div class="metric-title">Std Dev</div>
+                                    <div class="metric-value" style="font-size: 1.3rem;">${int(scenario_stats.close.std):,}</div>
+                                </div>
+                                <div style="margin-bottom: 12px;">
+                                    <div class="metric-title">Max Swing</div>
+                                    <div class="metric-value" style="font-size: 1.3rem;">${int(scenario_stats.swing):,}</div>
+                                </div>
+                                <div>
+                                    <div class="metric-title">Total Return</div>
+                                    <div class="metric-value" style="font-size: 1.3rem; color: {'#10b981' if scenario_return >= 0 else '#f87171'}">
+                                        {'+' if scenario_return >= 0 else ''}{scenario_return:.2f}%
+                                    </div>
+                                </div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                
+                st.markdown('<div class="spacer-lg"></div>', unsafe_allow_html=True)
+                
+                # Correlated Portfolio
+                st.markdown('<div class="chart-title">🧺 Correlated Multi-Asset Portfolio</div>', unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    n_assets = st.slider("Assets", min_value=2, max_value=500, value=20, step=1, key="portfolio_n_assets")
+                with col2:
+                    avg_corr = st.slider("Average correlation", min_value=0.0, max_value=0.95, value=0.5, step=0.05, key="portfolio_avg_corr")
+                
+                port_interval = portfolio_interval(days, n_assets, interval)
+                with timed('portfolio.simulate'):
+                    port_params, port_corr, port_dates, port_prices = load_portfolio(
+                        n_assets, avg_corr, days, base_price, amplitude, frequency, drift, noise, seed, port_interval)
+                port_value = portfolio_value(port_prices)
+                port_moments = Moments.from_array(port_value)
+                port_return = (port_value[-1] / port_value[0] - 1) * 100
+                
+                st.markdown(f'<div style="color: #94a3b8; font-size: 0.9rem; margin-bottom: 10px;">{n_assets} assets · one-factor correlation · {len(port_dates):,} {port_interval} bars · equal-weight ${PORTFOLIO_CAPITAL:,} buy-and-hold</div>', unsafe_allow_html=True)
+                
+                col1, col2 = st.columns([3, 2])
+                
+                with col1:
+                    with timed('figure.portfolio'):
+                        value_x, value_y = chart_points(port_dates, port_value, full_resolution)
+                        fig_port = new_figure(height=360, yaxis={'range': [port_moments.min * 0.98, port_moments.max * 1.02]})
+                        fig_port.add_trace(line_trace(len(value_y))(
+                            x=value_x,
+                            y=value_y,
+                            mode='lines',
+                            fill='tozeroy',
+                            fillcolor='rgba(139,92,246,0.12)',
+                            line=dict(color='#8b5cf6', width=2.5)
+                        ))
+                        st.plotly_chart(compact_figure(fig_port), width="stretch", config={'displayModeBar': False})
+                    
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Portfolio Value</div>
+                        <div class="metric-value" style="font-size: 1.3rem;">${int(port_value[-1]):,}</div>
+                        <div class="metric-label" style="color: {'#10b981' if port_return >= 0 else '#f87171'}">
+                            {'+' if port_return >= 0 else ''}{port_return:.2f}% · σ ${int(port_moments.std):,} · Swing ${int(port_moments.max - port_moments.min):,}
                         </div>
                     </div>
-                </div>
-            """, unsafe_allow_html=True)
-    
-    # Data Explorer Tab
-    with tab4:
-        col1, col2 = st.columns([3, 1])
+                """, unsafe_allow_html=True)
+                
+                with col2:
+                    # Realised correlation of bar-to-bar log returns
+                    with timed('figure.correlation'):
+                        log_returns = np.diff(np.log(port_prices), axis=0)
+                        realised_corr = np.corrcoef(log_returns, rowvar=False) if len(log_returns) > 1 else port_corr
+                        fig_corr = new_figure(
+                            go.Heatmap(
+                                z=np.round(realised_corr, 2),
+                                x=port_params['asset'],
+                                y=port_params['asset'],
+                                zmin=-1,
+                                zmax=1,
+                                colorscale=[[0, '#f87171'], [0.5, '#1a1f2e'], [1, '#2dd4bf']],
+                                showscale=True
+                            ),
+                            height=420,
+                            hovermode='closest',
+                            xaxis={'showticklabels': False},
+                            yaxis={'showticklabels': False, 'autorange': 'reversed'}
+                        )
+                        st.plotly_chart(compact_figure(fig_corr), width="stretch", config={'displayModeBar': False})
+                
+                # Per-asset OHLCV
+                asset_idx = st.selectbox(
+                    "Asset",
+                    range(n_assets),
+                    format_func=lambda k: f"{port_params['asset'][k]} · {port_params['pattern'][k]}"
+                )
+                with timed('figure.asset'):
+                    asset_df = resample_ohlcv(portfolio_asset_ohlcv(port_dates, port_prices, asset_idx, seed), MAX_CANDLES)
+                    fig_asset = new_figure(
+                        go.Candlestick(
+                            x=asset_df['date'],
+                            open=asset_df['open'],
+                            high=asset_df['high'],
+                            low=asset_df['low'],
+                            close=asset_df['close'],
+                            increasing_line_color='#10b981',
+                            decreasing_line_color='#f87171'
+                        ),
+                        height=300,
+                        xaxis={'rangeslider': {'visible': False}}
+                    )
+                    st.plotly_chart(compact_figure(fig_asset), width="stretch", config={'displayModeBar': False})
         
-        with col1:
-            st.markdown('<div class="chart-title">📋 OHLCV Dataset Explorer</div>', unsafe_allow_html=True)
-            st.markdown('<div style="color: #94a3b8; font-size: 0.9rem; margin-bottom: 20px;">Real-time OHLCV data inspection with preprocessing applied</div>', unsafe_allow_html=True)
+        # Data Explorer Tab
+        if tab4.open:
+            with tab4:
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    st.markdown('<div class="chart-title">📋 OHLCV Dataset Explorer</div>', unsafe_allow_html=True)
+                    st.markdown('<div style="color: #94a3b8; font-size: 0.9rem; margin-bottom: 20px;">Real-time OHLCV data inspection with preprocessing applied</div>', unsafe_allow_html=True)
+                
+                with col2:
+                    # Download: the file is only written when the button is clicked
+                    export_format = st.selectbox("Export Format", list(EXPORT_FORMATS), label_visibility="collapsed", key="export_format")
+                    extension, mime = EXPORT_FORMATS[export_format]
+                    st.download_button(
+                        label=f"⬇ Download {export_format}",
+                        data=lambda: export_ohlcv(df, export_format, view_interval),
+                        file_name=f"crypto_ohlcv_data.{extension}",
+                        mime=mime,
+                        on_click="ignore"
+                    )
+                
+                # Data Summary
+                col1, col2, col3, col4, col5, col6 = st.columns(6)
+                
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Total Rows</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">{len(df):,}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown("""
+                    <div class="metric-card">
+                        <div class="metric-title">Columns</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">6</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown("""
+                    <div class="metric-card">
+                        <div class="metric-title">Missing Data</div>
+                        <div class="metric-value" style="font-size: 1.4rem;">0</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                with col4:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Start Date</div>
+                        <div class="metric-value" style="font-size: 1rem;">{df['date'].min().strftime('%Y-%m-%d')}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                with col5:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">End Date</div>
+                        <div class="metric-value" style="font-size: 1rem;">{df['date'].max().strftime('%Y-%m-%d')}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                with col6:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <div class="metric-title">Avg Close</div>
+                        <div class="metric-value" style="font-size: 1rem;">${int(df['close'].mean()):,}</div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+                
+                # Data Table: numeric columns stay numeric, formatting happens in the browser,
+                # and only the current page is sliced out and sent
+                page_col1, page_col2, page_col3 = st.columns([1, 1, 2])
+                
+                with page_col1:
+                    page_size = st.selectbox("Rows per page", [100, 500, 1000, 5000], index=1, key="explorer_page_size")
+                
+                n_pages = max(1, -(-len(df) // page_size))
+                if st.session_state.get('explorer_page', 1) > n_pages:
+                    st.session_state.explorer_page = n_pages
+                
+                with page_col2:
+                    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key="explorer_page")
+                
+                start = (page - 1) * page_size
+                stop = min(start + page_size, len(df))
+                
+                with page_col3:
+                    st.markdown(f'<div style="color: #94a3b8; font-size: 0.9rem; margin-top: 36px;">Rows {start + 1:,}–{stop:,} of {len(df):,} · Page {page:,} of {n_pages:,}</div>', unsafe_allow_html=True)
+                
+                with timed('explorer.table'):
+                    st.dataframe(
+                        df.iloc[start:stop],
+                        width="stretch",
+                        height=500,
+                        hide_index=True,
+                        column_config={
+                            'date': st.column_config.DatetimeColumn(
+                                "Timestamp", format="YYYY-MM-DD" if view_interval == '1d' else "YYYY-MM-DD HH:mm"),
+                            'open': st.column_config.NumberColumn("Open", format="$%.2f"),
+                            'high': st.column_config.NumberColumn("High", format="$%.2f"),
+                            'low': st.column_config.NumberColumn("Low", format="$%.2f"),
+                            'close': st.column_config.NumberColumn("Close", format="$%.2f"),
+                            'volume': st.column_config.NumberColumn("Volume", format="%d")
+                        }
+                    )
         
-        with col2:
-            # CSV Download
-            csv = df.copy()
-            csv['date'] = csv['date'].dt.strftime('%Y-%m-%d')
-            csv_string = csv.to_csv(index=False)
-            st.download_button(
-                label="⬇ Download CSV",
-                data=csv_string,
-                file_name="crypto_ohlcv_data.csv",
-                mime="text/csv"
+        # Simulation cache status
+        with st.sidebar:
+            cache_stats = get_simulation_cache().stats()
+            st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
+            st.caption(
+                f"🗄️ Simulation cache: {cache_stats['hits']:,} hits · {cache_stats['misses']:,} misses · "
+                f"{cache_stats['entries']} entries · {cache_stats['bytes'] / 1e6:.1f} MB · {cache_stats['pinned']} pinned"
             )
         
-        # Data Summary
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-        
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Total Rows</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">{len(df)}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-title">Columns</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">6</div>
-                </div>
-            """, unsafe_allow_html=True)
+        # Rerun timings: JSON line plus a collapsible debug panel
+        if timer is not None:
+            ACTIVE_TIMER.set(None)
+            timer.log(view=st.session_state.view, rows=len(df), days=days, interval=view_interval, full_resolution=full_resolution,
+                      cache_hits=cache_stats['hits'], cache_misses=cache_stats['misses'])
+            with st.sidebar:
+                with st.expander(f"⏱️ Rerun timings · {timer.total_ms():,.0f} ms"):
+                    st.dataframe(
+                        timer.to_frame(),
+                        width="stretch",
+                        hide_index=True,
+                        column_config={
+                            'stage': st.column_config.TextColumn("Stage"),
+                            'ms': st.column_config.NumberColumn("ms", format="%.1f")
+                        }
+                    )
         
-        with col3:
-            st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-title">Missing Data</div>
-                    <div class="metric-value" style="font-size: 1.4rem;">0</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Start Date</div>
-                    <div class="metric-value" style="font-size: 1rem;">{df['date'].min().strftime('%Y-%m-%d')}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col5:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">End Date</div>
-                    <div class="metric-value" style="font-size: 1rem;">{df['date'].max().strftime('%Y-%m-%d')}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col6:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-title">Avg Close</div>
-                    <div class="metric-value" style="font-size: 1rem;">${int(df['close'].mean()):,}</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('<div class="spacer"></div>', unsafe_allow_html=True)
-        
-        # Data Table
-        display_df = df.copy()
-        display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-        display_df['open'] = display_df['open'].apply(lambda x: f"${x:.2f}")
-        display_df['high'] = display_df['high'].apply(lambda x: f"${x:.2f}")
-        display_df['low'] = display_df['low'].apply(lambda x: f"${x:.2f}")
-        display_df['close'] = display_df['close'].apply(lambda x: f"${x:.2f}")
-        display_df.columns = ['Timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']
-        
-        st.dataframe(
-            display_df,
-            width="stretch",
-            height=500,
-            hide_index=True
-        )
-    
-    # Footer
-    st.markdown("""
+        # Footer
+        st.markdown("""
         <div class="app-footer">
             <div style="font-size: 1.1rem; font-weight: 600; color: #2dd4bf; margin-bottom: 10px;">
                 📊 Crypto Volatility Visualizer
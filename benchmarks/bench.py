@@ -0,0 +1,207 @@
+"""Benchmarks for the simulation, OHLCV, metrics, rendering and export paths.
+
+Usage:
+    python benchmarks/bench.py                       # all benchmarks, default sizes
+    python benchmarks/bench.py --sizes 90 10000      # selected row counts
+    python benchmarks/bench.py --filter figure       # benchmarks whose name contains "figure"
+    python benchmarks/bench.py --compare benchmarks/results/<old>.json
+
+Each benchmark is timed over several repeats (best and median wall time)
+and then run once more under tracemalloc for peak memory. Results are
+written to benchmarks/results/<commit>.json; --compare prints the ratio
+against an earlier results file and exits non-zero on regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+
+import engine  # noqa: E402
+
+DEFAULT_SIZES = [90, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 5
+REGRESSION_RATIO = 1.25
+PARAMS = dict(base=45000, amplitude=5000, frequency=3, drift=50, noise=1500, pattern='Realistic Behavior')
+
+def horizon(rows):
+    """(days, interval) giving about ``rows`` bars: daily bars for small sizes, minute bars above"""
+    if rows <= 3650:
+        return rows, '1d'
+    return -(-rows // 1440), '1m'
+
+def make_frame(rows, seed=0):
+    """Simulated OHLCV frame of about ``rows`` bars"""
+    days, interval = horizon(rows)
+    return engine.simulate_asset(days, PARAMS['base'], PARAMS['amplitude'], PARAMS['frequency'], PARAMS['drift'],
+                                 PARAMS['noise'], PARAMS['pattern'], seed, 0, interval)
+
+def bench_simulate_price(rows):
+    days, interval = horizon(rows)
+    rng = engine.make_rng(0)
+    return lambda: engine.simulate_price(days, PARAMS['base'], PARAMS['amplitude'], PARAMS['frequency'],
+                                         PARAMS['drift'], PARAMS['noise'], PARAMS['pattern'], rng, interval)
+
+def bench_generate_ohlcv(rows):
+    days, interval = horizon(rows)
+    rng = engine.make_rng(0)
+    dates, prices = engine.simulate_price(days, PARAMS['base'], PARAMS['amplitude'], PARAMS['frequency'],
+                                          PARAMS['drift'], PARAMS['noise'], PARAMS['pattern'], rng, interval)
+    return lambda: engine.generate_ohlcv(dates, prices, rng)
+
+def bench_metrics(rows):
+    df = make_frame(rows)
+    return lambda: engine.PriceStats.from_frame(df)
+
+def bench_rolling_volatility(rows):
+    df = make_frame(rows)
+    interval = horizon(rows)[1]
+    return lambda: engine.rolling_volatility(df, 20, interval)
+
+def bench_figure_candle(rows):
+    df = make_frame(rows)
+
+    def run():
+        candles = engine.resample_ohlcv(df, engine.MAX_CANDLES)
+        fig = engine.new_figure(go.Candlestick(x=candles['date'], open=candles['open'], high=candles['high'],
+                                               low=candles['low'], close=candles['close']), height=360)
+        return engine.compact_figure(fig).to_json()
+    return run
+
+def bench_figure_line(rows):
+    df = make_frame(rows)
+
+    def run():
+        x, y = engine.chart_points(df['date'], df['close'])
+        fig = engine.new_figure(engine.line_trace(len(y))(x=x, y=y, mode='lines'), height=360)
+        return engine.compact_figure(fig).to_json()
+    return run
+
+def bench_figure_line_full(rows):
+    df = make_frame(rows)
+
+    def run():
+        x, y = engine.chart_points(df['date'], df['close'], full_resolution=True)
+        fig = engine.new_figure(engine.line_trace(len(y))(x=x, y=y, mode='lines'), height=360)
+        return engine.compact_figure(fig).to_json()
+    return run
+
+def bench_display_formatting(rows):
+    df = make_frame(rows)
+    interval = horizon(rows)[1]
+    return lambda: engine.format_dates(df['date'], interval)
+
+def bench_export_csv(rows):
+    df = make_frame(rows)
+    interval = horizon(rows)[1]
+    return lambda: engine.export_ohlcv(df, 'CSV', interval)
+
+def bench_export_parquet(rows):
+    df = make_frame(rows)
+    return lambda: engine.export_ohlcv(df, 'Parquet')
+
+BENCHMARKS = {
+    'simulate_price': bench_simulate_price,
+    'generate_ohlcv': bench_generate_ohlcv,
+    'metrics': bench_metrics,
+    'rolling_volatility': bench_rolling_volatility,
+    'figure_candle': bench_figure_candle,
+    'figure_line': bench_figure_line,
+    'figure_line_full': bench_figure_line_full,
+    'display_formatting': bench_display_formatting,
+    'export_csv': bench_export_csv,
+    'export_parquet': bench_export_parquet,
+}
+
+def measure(fn, repeat):
+    """Best/median wall time over ``repeat`` runs, then peak traced memory of one run"""
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), float(np.median(times)), peak
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(results, baseline_path):
+    """Print time ratios against a baseline results file; return the regressed entries"""
+    with open(baseline_path) as f:
+        baseline = {(r['name'], r['rows']): r for r in json.load(f)['results']}
+
+    regressions = []
+    print(f"\n{'benchmark':<22}{'rows':>10}{'old (ms)':>12}{'new (ms)':>12}{'ratio':>8}")
+    for r in results:
+        old = baseline.get((r['name'], r['rows']))
+        if old is None:
+            continue
+        ratio = r['min_s'] / old['min_s'] if old['min_s'] else float('inf')
+        flag = '  <-- slower' if ratio > REGRESSION_RATIO else ''
+        print(f"{r['name']:<22}{r['rows']:>10,}{old['min_s'] * 1e3:>12.2f}{r['min_s'] * 1e3:>12.2f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='approximate row counts')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed runs per benchmark')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'benchmarks', 'results'),
+                        help='directory for the JSON results')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'benchmark':<22}{'rows':>10}{'best (ms)':>12}{'median (ms)':>13}{'peak (MB)':>11}")
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        for size in args.sizes:
+            fn = setup(size)
+            best, median, peak = measure(fn, args.repeat)
+            rows = engine.bar_count(*horizon(size))
+            results.append({'name': name, 'rows': rows, 'repeat': args.repeat,
+                            'min_s': best, 'median_s': median, 'peak_bytes': peak})
+            print(f"{name:<22}{rows:>10,}{best * 1e3:>12.2f}{median * 1e3:>13.2f}{peak / 1e6:>11.1f}")
+
+    commit = git_commit()
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f'{commit}.json')
+    with open(path, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': pd.Timestamp.now(tz='UTC').isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'results': results
+        }, f, indent=2)
+    print(f'\nResults written to {path}')
+
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Headless simulation engine behind the Crypto Volatility Visualizer
+
+Importing the package loads neither Streamlit nor Plotly, so batch jobs and
+worker processes can use the same models the dashboard shows.
+"""
+from .timing import TIMING_ENV, TIMING_LOG_ENV, ACTIVE_TIMER, StageTimer, timed
+from .simulation import (RNG_STREAMS, WAVE_PATTERNS, BAR_INTERVALS, ENSEMBLE_PERCENTILES, OHLCV_COLUMNS,
+                         make_rng, new_seed, bar_count, price_curve, date_axis, format_dates, simulate_price,
+                         simulate_ensemble, generate_ohlcv, simulate_asset)
+from .metrics import VOLATILITY_ESTIMATORS, Moments, PriceStats, rolling_mean, rolling_std, rolling_volatility
+from .portfolio import (PORTFOLIO_CAPITAL, portfolio_interval, portfolio_params, factor_correlation,
+                        simulate_portfolio, portfolio_value, portfolio_asset_ohlcv)
+from .sweep import SWEEP_METRICS, sweep_metrics
+from .cache import SIM_CACHE_MAX_BYTES, SimulationCache, asset_key, simulate_scenario
+from .charts import (MAX_CHART_POINTS, MAX_CANDLES, UP_DOWN_COLORSCALE, chart_points, resample_ohlcv,
+                     extreme_bars, line_trace, get_plotly_layout, PLOTLY_TEMPLATE, plotly_template, new_figure,
+                     compact_values, compact_figure)
+from .export import EXPORT_FORMATS, export_ohlcv
+from .live import (LIVE_CAPACITY, LIVE_REFRESH_SECONDS, OHLCVRingBuffer, SimulatedFeed, ReplayServer, ReplayFeed,
+                   replay_file)
+from .datasource import (CACHE_DIR_ENV, DATASET_MAX_BARS, ingest_csv, csv_to_parquet, load_dataset, infer_interval,
+                         dataset_info, scan_dataset, resample_batches, query_dataset, dataset_intervals)
+
+__all__ = [
+    'TIMING_ENV', 'TIMING_LOG_ENV', 'ACTIVE_TIMER', 'StageTimer', 'timed',
+    'RNG_STREAMS', 'WAVE_PATTERNS', 'BAR_INTERVALS', 'ENSEMBLE_PERCENTILES', 'OHLCV_COLUMNS', 'make_rng',
+    'new_seed', 'bar_count', 'price_curve', 'date_axis', 'format_dates', 'simulate_price', 'simulate_ensemble',
+    'generate_ohlcv', 'simulate_asset',
+    'VOLATILITY_ESTIMATORS', 'Moments', 'PriceStats', 'rolling_mean', 'rolling_std', 'rolling_volatility',
+    'PORTFOLIO_CAPITAL', 'portfolio_interval', 'portfolio_params', 'factor_correlation', 'simulate_portfolio',
+    'portfolio_value', 'portfolio_asset_ohlcv',
+    'SWEEP_METRICS', 'sweep_metrics',
+    'SIM_CACHE_MAX_BYTES', 'SimulationCache', 'asset_key', 'simulate_scenario',
+    'MAX_CHART_POINTS', 'MAX_CANDLES', 'UP_DOWN_COLORSCALE', 'chart_points', 'resample_ohlcv', 'extreme_bars',
+    'line_trace', 'get_plotly_layout', 'PLOTLY_TEMPLATE', 'plotly_template', 'new_figure', 'compact_values',
+    'compact_figure',
+    'EXPORT_FORMATS', 'export_ohlcv',
+    'LIVE_CAPACITY', 'LIVE_REFRESH_SECONDS', 'OHLCVRingBuffer', 'SimulatedFeed', 'ReplayServer', 'ReplayFeed',
+    'replay_file',
+    'CACHE_DIR_ENV', 'DATASET_MAX_BARS', 'ingest_csv', 'csv_to_parquet', 'load_dataset', 'infer_interval',
+    'dataset_info', 'scan_dataset', 'resample_batches', 'query_dataset', 'dataset_intervals',
+]
@@ -0,0 +1,191 @@
+"""Headless batch generation of simulated OHLCV datasets to partitioned Parquet
+
+Usage:
+    python -m engine.batch SPEC.json OUT_DIR [--workers N]
+
+The spec is a JSON object of simulation parameters plus seeds. Any parameter
+may be a list; the scenarios are the cartesian product of the lists, and
+every scenario is simulated once per seed:
+
+    {
+        "pattern": ["Sine Wave (Smooth Cycles)", "Realistic Behavior"],
+        "amplitude": [1000, 5000, 10000],
+        "frequency": 3,
+        "drift": [-50, 0, 50],
+        "noise": [500, 1500],
+        "base": 45000,
+        "days": 365,
+        "interval": "1h",
+        "seeds": {"start": 0, "count": 100}
+    }
+
+Each dataset is written to OUT_DIR/scenario=<id>/seed=<seed>/part-0.parquet
+(hive partitioning), with the scenario parameters in OUT_DIR/_scenarios.parquet
+and the spec in OUT_DIR/_spec.json; readers of the dataset skip both, as they
+skip in-progress files (hidden until complete). Files are written atomically, so an interrupted run picks up where it left
+off when restarted with the same spec. A dataset with seed S matches the
+dashboard's main asset for the same parameters and seed S.
+"""
+import argparse
+import itertools
+import json
+import math
+import numbers
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .simulation import WAVE_PATTERNS, BAR_INTERVALS, RNG_STREAMS, simulate_asset
+from .export import export_ohlcv
+
+PROGRESS_SECONDS = 0.5  # minimum interval between progress reports
+
+# Spec parameters in simulate_asset order, with their defaults (the dashboard's)
+SPEC_DEFAULTS = {
+    'days': 90,
+    'base': 45000,
+    'amplitude': 5000,
+    'frequency': 3,
+    'drift': 50,
+    'noise': 1500,
+    'pattern': 'Sine Wave (Smooth Cycles)',
+    'interval': '1d',
+}
+
+def is_integer(value, minimum):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+def check_number(name, value):
+    """Raise ValueError unless a numeric spec parameter holds a usable value"""
+    if name == 'days':
+        if not is_integer(value, 1):
+            raise ValueError(f"Spec parameter 'days' must be a positive integer, not {value!r}")
+    elif not isinstance(value, numbers.Real) or isinstance(value, bool) or not math.isfinite(value):
+        raise ValueError(f"Spec parameter {name!r} must be a number, not {value!r}")
+    elif name == 'noise' and value < 0:
+        raise ValueError(f"Spec parameter 'noise' must not be negative, not {value!r}")
+
+def spec_seeds(seeds):
+    """Seed list from an int, a list, or {"start": s, "count": n}"""
+    if isinstance(seeds, dict):
+        start, count = seeds.get('start', 0), seeds.get('count')
+        if not is_integer(start, 0) or not is_integer(count, 0):
+            raise ValueError(f"Spec 'seeds' needs non-negative integer 'start' and 'count', not {seeds!r}")
+        return list(range(start, start + count))
+    seeds = seeds if isinstance(seeds, list) else [seeds]
+    for seed in seeds:
+        if not is_integer(seed, 0):
+            raise ValueError(f"Spec seeds must be non-negative integers, not {seed!r}")
+    return seeds
+
+def expand_spec(spec):
+    """Scenario table (one row per parameter combination) and the seed list of a spec"""
+    unknown = set(spec) - set(SPEC_DEFAULTS) - {'seeds'}
+    if unknown:
+        raise ValueError(f"Unknown spec keys: {', '.join(sorted(unknown))}")
+    
+    values = {name: spec.get(name, default) for name, default in SPEC_DEFAULTS.items()}
+    grid = {name: value if isinstance(value, list) else [value] for name, value in values.items()}
+    for pattern in grid['pattern']:
+        if pattern not in WAVE_PATTERNS:
+            raise ValueError(f"Unknown pattern {pattern!r}; expected one of {list(WAVE_PATTERNS)}")
+    for interval in grid['interval']:
+        if interval not in BAR_INTERVALS:
+            raise ValueError(f"Unknown interval {interval!r}; expected one of {list(BAR_INTERVALS)}")
+    # Checked here rather than left to the workers, which would fail mid-run
+    for name in ('days', 'base', 'amplitude', 'frequency', 'drift', 'noise'):
+        for value in grid[name]:
+            check_number(name, value)
+    
+    scenarios = pd.DataFrame(list(itertools.product(*grid.values())), columns=list(grid))
+    scenarios.insert(0, 'scenario', range(len(scenarios)))
+    return scenarios, spec_seeds(spec.get('seeds', 0))
+
+def dataset_path(out_dir, scenario, seed):
+    return os.path.join(out_dir, f'scenario={scenario}', f'seed={seed}', 'part-0.parquet')
+
+def generate_dataset(path, days, base, amplitude, frequency, drift, noise, pattern, interval, seed):
+    """Simulate one dataset and write it to path atomically (worker task); returns its row count"""
+    df = simulate_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, RNG_STREAMS['main'], interval)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Hidden from dataset readers until renamed; a leftover from an interrupted
+    # run is simply overwritten
+    tmp = os.path.join(os.path.dirname(path), '.' + os.path.basename(path))
+    with open(tmp, 'wb') as f:
+        export_ohlcv(df, 'Parquet', interval, out=f)
+    os.replace(tmp, path)
+    return len(df)
+
+def prepare_output(out_dir, spec, scenarios):
+    """Create the output directory; ValueError if it was made from a different spec"""
+    os.makedirs(out_dir, exist_ok=True)
+    spec_path = os.path.join(out_dir, '_spec.json')
+    if os.path.exists(spec_path):
+        with open(spec_path) as f:
+            if json.load(f) != spec:
+                raise ValueError(f'{out_dir} was generated from a different spec; use a new output directory')
+    else:
+        with open(spec_path, 'w') as f:
+            json.dump(spec, f, indent=2)
+    scenarios.to_parquet(os.path.join(out_dir, '_scenarios.parquet'), index=False)
+
+def report(done, total, skipped, rows, start):
+    """One-line progress report on stderr, rewritten in place"""
+    elapsed = time.perf_counter() - start
+    rate = (done - skipped) / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    print(f'\r[{done:>{len(str(total))}}/{total}] {done / total:6.1%} · {rate:,.1f} datasets/s · '
+          f'{rows:,} rows · ETA {eta:,.0f}s', end='', file=sys.stderr, flush=True)
+
+def run(spec, out_dir, workers=None):
+    """Generate every (scenario, seed) dataset of a spec that is not already on disk"""
+    scenarios, seeds = expand_spec(spec)
+    prepare_output(out_dir, spec, scenarios)
+    
+    tasks = []
+    for row in scenarios.itertuples(index=False):
+        for seed in seeds:
+            path = dataset_path(out_dir, row.scenario, seed)
+            if not os.path.exists(path):
+                tasks.append((path, row.days, row.base, row.amplitude, row.frequency, row.drift, row.noise,
+                              row.pattern, row.interval, seed))
+    
+    total = len(scenarios) * len(seeds)
+    skipped = total - len(tasks)
+    done, rows = skipped, 0
+    start = last_report = time.perf_counter()
+    if skipped:
+        print(f'Resuming: {skipped:,} of {total:,} datasets already written', file=sys.stderr)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_dataset, *task) for task in tasks]
+        for future in as_completed(futures):
+            rows += future.result()
+            done += 1
+            if done == total or time.perf_counter() - last_report >= PROGRESS_SECONDS:
+                report(done, total, skipped, rows, start)
+                last_report = time.perf_counter()
+    print(file=sys.stderr)
+    return len(tasks)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.batch', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('spec', help='scenario spec (JSON)')
+    parser.add_argument('out_dir', help='output directory for the Parquet datasets')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='worker processes')
+    args = parser.parse_args(argv)
+    
+    with open(args.spec) as f:
+        spec = json.load(f)
+    try:
+        written = run(spec, args.out_dir, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f'{written:,} datasets written to {args.out_dir}', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Byte-capped simulation cache and its keys"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .simulation import simulate_asset
+from .metrics import PriceStats
+
+def nbytes(value):
+    """Approximate in-memory size of a cached simulation result"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+MISSING = object()  # get() default that no cached value can equal
+
+class SimulationCache:
+    """Thread-safe LRU cache of simulation results, capped by total bytes
+    
+    Pinned entries (precomputed defaults) sit outside the cap and are never evicted.
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.pinned = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Cached value for key, or default; counted as a hit or a miss"""
+        with self.lock:
+            if key in self.pinned:
+                self.hits += 1
+                return self.pinned[key]
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return default
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        
+        # Compute outside the lock so other sessions are not blocked
+        value = compute()
+        self.put(key, value)
+        return value
+    
+    def put(self, key, value):
+        """Store a value computed elsewhere (e.g. in a worker process)"""
+        size = nbytes(value)
+        with self.lock:
+            if key not in self.entries and size <= self.max_bytes:
+                self.entries[key] = (value, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted) = self.entries.popitem(last=False)
+                    self.total_bytes -= evicted
+                    self.evictions += 1
+    
+    def pin(self, key, value):
+        """Store a value that is shared for the life of the process and never evicted"""
+        with self.lock:
+            self.pinned[key] = value
+    
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.pinned or key in self.entries
+    
+    def stats(self):
+        """Hit/miss counters and current memory footprint"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'pinned': len(self.pinned)
+            }
+
+SIM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def asset_key(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval='1d'):
+    """Cache key fields identifying one simulated asset"""
+    return (pattern, amplitude, frequency, drift, noise, base, days, interval, seed, stream)
+
+def simulate_scenario(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval='1d'):
+    """Simulate one asset and its PriceStats (process-pool work item)"""
+    df = simulate_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval)
+    return df, PriceStats.from_frame(df)
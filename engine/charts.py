@@ -0,0 +1,185 @@
+"""Chart data reduction and the shared Plotly styling
+
+Plotly itself is only imported when a trace class or figure is requested.
+"""
+import numpy as np
+import pandas as pd
+
+# Cap on points per line trace, roughly the pixel width of a full-width chart
+MAX_CHART_POINTS = 2000
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling of (x, y)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Gaps (e.g. a rolling window's warm-up) would turn every bucket average into
+    # NaN, so only finite points are bucketed; indices refer back to the input
+    finite = np.isfinite(y)
+    if not finite.all():
+        keep = np.flatnonzero(finite)
+        return keep[lttb_indices(x[keep], y[keep], n_out)]
+    
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = x - x[0]
+    
+    # First and last points are always kept; the rest fall into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    x_sum = np.concatenate(([0.0], np.cumsum(x)))
+    y_sum = np.concatenate(([0.0], np.cumsum(y)))
+    
+    # Average point of the following bucket (the last point for the final bucket)
+    next_lo = np.append(edges[1:-1], n - 1)
+    next_hi = np.append(edges[2:], n)
+    next_count = next_hi - next_lo
+    avg_x = (x_sum[next_hi] - x_sum[next_lo]) / next_count
+    avg_y = (y_sum[next_hi] - y_sum[next_lo]) / next_count
+    
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - avg_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[b] - y[a]))
+        a = lo + int(area.argmax())
+        idx[b + 1] = a
+    return idx
+
+def chart_points(dates, values, full_resolution=False, max_points=MAX_CHART_POINTS):
+    """Dates and values to plot, LTTB-downsampled unless full resolution is requested"""
+    dates = np.asarray(dates)
+    values = np.asarray(values, dtype=np.float64)
+    if full_resolution or len(values) <= max_points:
+        return dates, values
+    
+    idx = lttb_indices(dates.astype('datetime64[ns]').astype(np.int64), values, max_points)
+    return dates[idx], values[idx]
+
+# Cap on candles and bars per chart; longer series are re-bucketed server-side
+MAX_CANDLES = 500
+
+def bucket_starts(n, n_buckets):
+    """Start index of each of n_buckets near-equal, contiguous buckets over n rows"""
+    return np.linspace(0, n, n_buckets, endpoint=False).astype(np.int64)
+
+def resample_ohlcv(df, n_buckets):
+    """Aggregate OHLCV bars into at most n_buckets candles"""
+    n = len(df)
+    if n <= n_buckets:
+        return df
+    
+    starts = bucket_starts(n, n_buckets)
+    ends = np.append(starts[1:], n) - 1
+    return pd.DataFrame({
+        'date': df['date'].to_numpy()[starts],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts)
+    })
+
+def extreme_bars(dates, values, n_buckets):
+    """Reduce a bar series to the largest-magnitude value in each bucket"""
+    dates = np.asarray(dates)
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= n_buckets:
+        return dates, values
+    
+    starts = bucket_starts(len(values), n_buckets)
+    high = np.maximum.reduceat(values, starts)
+    low = np.minimum.reduceat(values, starts)
+    return dates[starts], np.where(np.abs(high) >= np.abs(low), high, low)
+
+def line_trace(n_points):
+    """Scatter trace class for a line chart: WebGL once SVG would get heavy"""
+    import plotly.graph_objects as go
+    return go.Scattergl if n_points > MAX_CHART_POINTS else go.Scatter
+
+# Two-colour scale for up (1) / down (0) bars; numeric colours keep Plotly
+# from validating one colour string per bar
+UP_DOWN_COLORSCALE = [[0, 'rgba(248,113,113,0.7)'], [1, 'rgba(16,185,129,0.7)']]
+
+def get_plotly_layout():
+    """Layout of the shared dark theme"""
+    return {
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        'plot_bgcolor': 'rgba(15,20,25,0.4)',
+        'font': {'color': '#ecf0f1', 'family': 'Outfit, sans-serif', 'size': 11},
+        'margin': {'l': 50, 'r': 20, 't': 10, 'b': 40},
+        'xaxis': {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)'},
+        'yaxis': {'gridcolor': 'rgba(255,255,255,0.05)', 'linecolor': 'rgba(255,255,255,0.1)', 'tickprefix': '$'},
+        'showlegend': False,
+        'hovermode': 'x unified'
+    }
+
+# The theme is registered once as a named template, so each figure carries a
+# reference-sized template instead of Plotly's default one (~6.5 KB of JSON)
+PLOTLY_TEMPLATE = 'cvv_dark'
+
+# Trace properties sent as typed arrays, and the largest float32 rounding
+# error allowed, as a fraction of the series' range (well under a pixel)
+TRACE_ARRAYS = ('x', 'y', 'open', 'high', 'low', 'close', 'width')
+FLOAT32_TOLERANCE = 1e-5
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+def plotly_template():
+    """Name of the shared dark theme template, registering it on first use"""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    if PLOTLY_TEMPLATE not in pio.templates:
+        pio.templates[PLOTLY_TEMPLATE] = go.layout.Template(layout=get_plotly_layout())
+    return PLOTLY_TEMPLATE
+
+def new_figure(*traces, **layout):
+    """Plotly figure in the shared dark theme, with layout overrides"""
+    import plotly.graph_objects as go
+    return go.Figure(list(traces), layout={'template': plotly_template(), **layout})
+
+def epoch_ms(dates):
+    """Dates as float64 milliseconds since the epoch, which Plotly date axes read directly"""
+    return np.asarray(dates, dtype='datetime64[ms]').astype(np.float64)
+
+def compact_values(values, tolerance=FLOAT32_TOLERANCE):
+    """A float series as float32 when the rounding stays within tolerance of its range, else float64"""
+    values = np.asarray(values, dtype=np.float64)
+    narrow = values.astype(np.float32)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return narrow
+    span = np.ptp(values[finite]) or np.abs(values[finite]).max() or 1.0
+    error = np.abs(narrow[finite] - values[finite]).max()
+    return narrow if error <= span * tolerance else values
+
+def set_array(trace, name, values):
+    """Replace a trace array, dtype included"""
+    # Plotly skips assignments equal in value to the current array, which would
+    # keep an int64 or exactly representable float64 array at full width
+    trace[name] = None
+    trace[name] = values
+
+def compact_figure(fig):
+    """Shrink a figure's JSON in place: dates become epoch milliseconds, integers
+    int32 and floats float32 where precise enough, all sent base64-encoded"""
+    for trace in fig.data:
+        for name in TRACE_ARRAYS:
+            if name not in trace:
+                continue
+            values = trace[name]
+            if not isinstance(values, np.ndarray) or values.ndim != 1:
+                continue
+            if values.dtype.kind == 'M' and name in ('x', 'y'):
+                set_array(trace, name, epoch_ms(values))
+                axis = trace[name + 'axis'] or name  # 'x', 'x2', ...
+                fig.update_layout({name + 'axis' + axis[1:]: {'type': 'date'}})
+            elif values.dtype.kind in 'iu':
+                # Plotly has no 64-bit integer typed array, so int64 would go out as a JSON list
+                fits = len(values) == 0 or (values.min() >= INT32_MIN and values.max() <= INT32_MAX)
+                set_array(trace, name, values.astype(np.int32) if fits else compact_values(values))
+            elif values.dtype.kind == 'f':
+                set_array(trace, name, compact_values(values))
+    return fig
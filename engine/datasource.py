@@ -0,0 +1,281 @@
+"""Real OHLCV datasets: chunked CSV ingest into a memory-mapped Parquet cache
+
+A CSV is parsed once, block by block with explicit column types, and
+written to CVV_CACHE_DIR/<content hash>.parquet (one row group per block).
+Later loads of the same content memory-map that file instead of parsing,
+and date-range queries read only the row groups that overlap the range.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
+
+from .simulation import BAR_INTERVALS, OHLCV_COLUMNS
+
+CACHE_DIR_ENV = 'CVV_CACHE_DIR'
+CSV_BLOCK_BYTES = 64 * 1024 * 1024  # parse block, and so Parquet row group, size
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+DATASET_MAX_BARS = 1_000_000  # cap on bars loaded for one view (~48 MB of OHLCV)
+
+# Accepted CSV header names (case-insensitive) for each OHLCV column
+CSV_COLUMN_NAMES = {
+    'date': ['timestamp', 'date', 'datetime', 'time', 'open_time'],
+    'open': ['open'],
+    'high': ['high'],
+    'low': ['low'],
+    'close': ['close'],
+    'volume': ['volume'],
+}
+OHLCV_SCHEMA = pa.schema([('date', pa.timestamp('ns'))] + [(name, pa.float64()) for name in OHLCV_COLUMNS[1:]])
+
+# Epoch timestamps: unit by magnitude (values above the threshold use that unit)
+EPOCH_UNITS = [(1e17, 'ns'), (1e14, 'us'), (1e11, 'ms'), (0, 's')]
+ZONE_OFFSET = re.compile(r'(Z|[+-]\d\d:?\d\d)$')
+
+def cache_dir():
+    """Directory of converted datasets, created on first use"""
+    path = os.environ.get(CACHE_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'cvv-cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def file_digest(source, chunk_bytes=HASH_CHUNK_BYTES):
+    """Content hash of a path or binary file object (which is rewound afterwards)"""
+    h = hashlib.sha1()
+    f = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        while chunk := f.read(chunk_bytes):
+            h.update(chunk)
+    finally:
+        if f is source:
+            f.seek(0)
+        else:
+            f.close()
+    return h.hexdigest()
+
+def csv_header(source):
+    """Header names and first data row of a CSV path or binary file object"""
+    f = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        header = f.readline().decode('utf-8-sig')
+        first = f.readline().decode('utf-8')
+    finally:
+        if f is source:
+            f.seek(0)
+        else:
+            f.close()
+    split = lambda line: [v.strip().strip('"') for v in line.strip().split(',')]
+    return split(header), split(first)
+
+def csv_columns(names):
+    """Map each OHLCV column to its CSV header name; ValueError if any is missing"""
+    lower = {name.lower(): name for name in names}
+    mapping, missing = {}, []
+    for column, candidates in CSV_COLUMN_NAMES.items():
+        found = next((lower[c] for c in candidates if c in lower), None)
+        if found is None:
+            missing.append(column)
+        else:
+            mapping[column] = found
+    if missing:
+        raise ValueError(f"CSV is missing OHLCV columns: {', '.join(missing)} (header: {', '.join(names)})")
+    return mapping
+
+def timestamp_type(sample):
+    """Arrow type to parse the timestamp column as, judged from its first value"""
+    if sample.isdigit():
+        return pa.int64()  # epoch; converted after parsing
+    if ZONE_OFFSET.search(sample):
+        return pa.timestamp('ns', tz='UTC')
+    return pa.timestamp('ns')
+
+def to_naive_ns(dates):
+    """Timestamp column as tz-naive (UTC) nanoseconds"""
+    if pa.types.is_integer(dates.type):
+        top = pc.max(dates).as_py() or 0
+        unit = next(unit for threshold, unit in EPOCH_UNITS if top > threshold)
+        dates = dates.cast(pa.timestamp(unit))
+    return dates.cast(pa.timestamp('ns'))
+
+def csv_convert_options(names, first):
+    """Column mapping and Arrow convert options for a CSV with this header and first row"""
+    mapping = csv_columns(names)
+    date_sample = first[names.index(mapping['date'])] if len(first) == len(names) else ''
+    column_types = {mapping[c]: pa.float64() for c in OHLCV_COLUMNS[1:]}
+    column_types[mapping['date']] = timestamp_type(date_sample)
+    return mapping, pa_csv.ConvertOptions(column_types=column_types,
+                                          include_columns=[mapping[c] for c in OHLCV_COLUMNS])
+
+def ohlcv_table(batch, mapping):
+    """Parsed CSV batch as an OHLCV_SCHEMA table, without incomplete rows"""
+    columns = [to_naive_ns(batch.column(mapping['date']))]
+    columns += [batch.column(mapping[c]) for c in OHLCV_COLUMNS[1:]]
+    return pa.Table.from_arrays(columns, schema=OHLCV_SCHEMA).drop_null()
+
+def csv_to_parquet(source, path, block_bytes=CSV_BLOCK_BYTES):
+    """Convert an OHLCV CSV to Parquet block by block; returns the row count"""
+    mapping, convert_options = csv_convert_options(*csv_header(source))
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=block_bytes),
+        convert_options=convert_options
+    )
+    
+    rows = 0
+    last_date = None
+    # A unique, hidden temp file: sessions converting the same upload at once
+    # each write their own, and the last rename wins with identical content
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.', suffix='.parquet')
+    os.close(fd)
+    try:
+        with pq.ParquetWriter(tmp, OHLCV_SCHEMA) as writer:
+            for batch in reader:
+                table = ohlcv_table(batch, mapping)
+                if len(table) == 0:
+                    continue
+                
+                # Bars must be in time order for the charts and for range queries
+                dates = table.column('date').to_numpy()
+                if (last_date is not None and dates[0] < last_date) or np.any(dates[1:] < dates[:-1]):
+                    raise ValueError('CSV rows are not in time order')
+                last_date = dates[-1]
+                
+                writer.write_table(table)
+                rows += len(table)
+        if rows == 0:
+            raise ValueError('CSV has no complete OHLCV rows')
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return rows
+
+def ingest_csv(source):
+    """Path of the Parquet cache for a CSV path or binary file object, converting it on first use"""
+    path = os.path.join(cache_dir(), f'{file_digest(source)}.parquet')
+    if not os.path.exists(path):
+        csv_to_parquet(source, path)
+    return path
+
+def load_dataset(path):
+    """OHLCV frame of a cached dataset, read through a memory map"""
+    return pq.read_table(path, memory_map=True).to_pandas()
+
+def bar_seconds(interval):
+    return 86400 / BAR_INTERVALS[interval][1]
+
+def bar_spacing(dates):
+    """Median spacing of a bar series in seconds (a day for fewer than two bars)"""
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    if len(dates) < 2:
+        return 86400.0
+    return float(np.median(np.diff(dates).astype(np.int64))) / 1e9
+
+def infer_interval(dates):
+    """Finest BAR_INTERVALS key at least as coarse as the spacing of a bar series
+    
+    Bars spaced between two intervals (15m, 4h) fall to the coarser one and have
+    to be resampled to it; they are never shown as if they were the finer one.
+    """
+    spacing = bar_spacing(dates)
+    return next((name for name in BAR_INTERVALS if bar_seconds(name) >= spacing), list(BAR_INTERVALS)[-1])
+
+# Queries over the cache: a date range is pushed down to the Parquet scan, so
+# row groups outside it are skipped using their min/max statistics
+def dataset_info(path):
+    """First bar, last bar, row count and native interval of a cached dataset, without reading it
+    
+    ``exact`` is whether the bars are spaced at exactly that interval, so they can be
+    shown without resampling.
+    """
+    f = pq.ParquetFile(path, memory_map=True)
+    meta = f.metadata
+    date_col = f.schema_arrow.get_field_index('date')
+    first = meta.row_group(0).column(date_col).statistics.min
+    last = meta.row_group(meta.num_row_groups - 1).column(date_col).statistics.max
+    sample = f.read_row_group(0, columns=['date']).column('date').to_numpy()[:1000]
+    interval = infer_interval(sample)
+    return {
+        'first': pd.Timestamp(first),
+        'last': pd.Timestamp(last),
+        'rows': meta.num_rows,
+        'interval': interval,
+        'exact': bar_spacing(sample) == bar_seconds(interval)
+    }
+
+def scan_dataset(path, start=None, end=None):
+    """Record batches of a cached dataset with start <= date < end"""
+    date = pa_ds.field('date')
+    condition = None
+    if start is not None:
+        condition = date >= pa.scalar(pd.Timestamp(start).as_unit('ns'), pa.timestamp('ns'))
+    if end is not None:
+        before_end = date < pa.scalar(pd.Timestamp(end).as_unit('ns'), pa.timestamp('ns'))
+        condition = before_end if condition is None else condition & before_end
+    return pa_ds.dataset(path, format='parquet').to_batches(filter=condition)
+
+def resample_batches(batches, interval):
+    """Aggregate time-ordered OHLCV record batches into ``interval`` bars, one batch at a time
+    
+    Only the aggregated bars and the still-open last bar are held in memory.
+    """
+    step = pd.Timedelta(BAR_INTERVALS[interval][0]).value
+    parts = []
+    carry = None  # last bar of the previous batch, which the next batch may extend
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        cols = {name: batch.column(name).to_numpy(zero_copy_only=False) for name in OHLCV_COLUMNS}
+        bucket = cols['date'].astype('datetime64[ns]').astype(np.int64) // step * step
+        starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+        ends = np.append(starts[1:], len(bucket)) - 1
+        bars = {
+            'date': bucket[starts],
+            'open': cols['open'][starts],
+            'high': np.maximum.reduceat(cols['high'], starts),
+            'low': np.minimum.reduceat(cols['low'], starts),
+            'close': cols['close'][ends],
+            'volume': np.add.reduceat(cols['volume'], starts)
+        }
+        if carry is not None:
+            if carry['date'][0] == bars['date'][0]:
+                bars['open'][0] = carry['open'][0]
+                bars['high'][0] = max(bars['high'][0], carry['high'][0])
+                bars['low'][0] = min(bars['low'][0], carry['low'][0])
+                bars['volume'][0] += carry['volume'][0]
+            else:
+                parts.append(carry)
+        parts.append({name: values[:-1] for name, values in bars.items()})
+        carry = {name: values[-1:] for name, values in bars.items()}
+    if carry is not None:
+        parts.append(carry)
+    
+    if not parts:
+        return pd.DataFrame({name: np.array([], dtype=OHLCV_SCHEMA.field(name).type.to_pandas_dtype())
+                             for name in OHLCV_COLUMNS})
+    df = pd.DataFrame({name: np.concatenate([part[name] for part in parts]) for name in OHLCV_COLUMNS})
+    df['date'] = df['date'].astype('datetime64[ns]')
+    return df
+
+def query_dataset(path, start=None, end=None, interval=None):
+    """OHLCV frame of a cached dataset between start (inclusive) and end (exclusive),
+    resampled to ``interval`` bars if given, without loading the rest of the file"""
+    if interval is None:
+        return pa.Table.from_batches(scan_dataset(path, start, end), schema=OHLCV_SCHEMA).to_pandas()
+    return resample_batches(scan_dataset(path, start, end), interval)
+
+def dataset_intervals(native, start, end, max_bars=DATASET_MAX_BARS):
+    """Bar intervals, no finer than the native one, that keep [start, end) under max_bars bars"""
+    names = list(BAR_INTERVALS)
+    span_days = (pd.Timestamp(end) - pd.Timestamp(start)) / pd.Timedelta(days=1)
+    options = [name for name in names[names.index(native):] if span_days * BAR_INTERVALS[name][1] <= max_bars]
+    return options or names[-1:]
+
@@ -0,0 +1,35 @@
+"""OHLCV export to CSV, Parquet and Arrow IPC"""
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .simulation import format_dates
+
+# Export formats: file extension and MIME type
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow IPC': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+EXPORT_CHUNK_ROWS = 100_000
+
+def export_ohlcv(df, fmt, interval='1d', chunk_rows=EXPORT_CHUNK_ROWS, out=None):
+    """Write OHLCV data in the given export format, chunk by chunk, to ``out`` (a new BytesIO by default)"""
+    if out is None:
+        out = io.BytesIO()
+    chunks = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+    
+    if fmt == 'CSV':
+        for i, chunk in enumerate(chunks):
+            chunk = chunk.assign(date=format_dates(chunk['date'], interval))
+            out.write(chunk.to_csv(index=False, header=(i == 0)).encode())
+    else:
+        schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        writer = pq.ParquetWriter(out, schema) if fmt == 'Parquet' else pa.ipc.new_file(out, schema)
+        with writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    
+    out.seek(0)
+    return out
@@ -0,0 +1,175 @@
+"""Live bar feeds: ring buffer, simulated continuation and CSV replay over TCP"""
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+import time
+import weakref
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pyarrow.csv as pa_csv
+
+from .simulation import BAR_INTERVALS, OHLCV_COLUMNS, price_curve, generate_ohlcv
+from .datasource import csv_header, csv_convert_options, ohlcv_table
+
+# Live mode: ring buffer capacity (bars kept on screen) and refresh period
+LIVE_CAPACITY = 5000
+LIVE_REFRESH_SECONDS = 1.0
+
+class OHLCVRingBuffer:
+    """Fixed-capacity OHLCV store; appends overwrite the oldest bars in place"""
+    
+    def __init__(self, capacity=LIVE_CAPACITY):
+        self.capacity = capacity
+        self.dates = np.empty(capacity, dtype='datetime64[ns]')
+        self.values = np.empty((5, capacity))  # open, high, low, close, volume
+        self.head = 0  # next write position
+        self.size = 0
+    
+    def append(self, bars):
+        """Append a frame of new bars, keeping only the newest ``capacity``"""
+        n = len(bars)
+        if n == 0:
+            return
+        if n > self.capacity:
+            bars = bars.iloc[-self.capacity:]
+            n = self.capacity
+        
+        idx = (self.head + np.arange(n)) % self.capacity
+        self.dates[idx] = bars['date'].to_numpy(dtype='datetime64[ns]')
+        self.values[:, idx] = bars[OHLCV_COLUMNS[1:]].to_numpy(dtype=np.float64).T
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+    
+    def to_frame(self):
+        """Buffered bars as an OHLCV frame, oldest first"""
+        order = (self.head - self.size + np.arange(self.size)) % self.capacity
+        open_price, high, low, close, volume = self.values[:, order]
+        return pd.DataFrame({
+            'date': self.dates[order],
+            'open': open_price,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume.astype(np.int64)
+        })
+
+class SimulatedFeed:
+    """Continues a simulated series past its horizon at a fixed bar rate"""
+    
+    def __init__(self, df, days, base, amplitude, frequency, drift, noise, pattern, interval, rng, bars_per_sec):
+        self.params = (days, base, amplitude, frequency, drift, pattern, interval)
+        self.noise = noise
+        self.rng = rng
+        self.bars_per_sec = bars_per_sec
+        self.step = pd.Timedelta(BAR_INTERVALS[interval][0]).to_timedelta64()
+        self.next_index = len(df)
+        self.last_date = df['date'].to_numpy()[-1]
+        self.last_emit = time.monotonic()
+    
+    def drain(self):
+        """Bars due since the last call, simulated in one batch"""
+        now = time.monotonic()
+        k = min(int((now - self.last_emit) * self.bars_per_sec), LIVE_CAPACITY)
+        if k == 0:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        self.last_emit += k / self.bars_per_sec
+        if self.last_emit < now - 1:
+            self.last_emit = now  # don't build up a backlog while the page is idle
+        
+        curve = price_curve(*self.params, start=self.next_index, count=k)
+        prices = np.maximum(100, curve + self.noise * self.rng.standard_normal(k))
+        dates = self.last_date + self.step * np.arange(1, k + 1)
+        self.next_index += k
+        self.last_date = dates[-1]
+        return generate_ohlcv(dates, prices, self.rng)
+    
+    finished = False  # a simulated feed never runs out
+    
+    def close(self):
+        pass
+
+class ReplayServer:
+    """Local asyncio TCP server replaying an OHLCV CSV as a bar feed (exchange stand-in)"""
+    
+    def __init__(self, path, bars_per_sec, host='127.0.0.1'):
+        self.path = path
+        self.bars_per_sec = bars_per_sec
+        self.host = host
+        self.port = None
+        self.server = None
+    
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def handle(self, reader, writer):
+        """Stream the file's rows once to one client at the configured rate, or until it disconnects"""
+        try:
+            with open(self.path) as f:
+                next(f, None)  # header; clients read it from the file
+                for line in f:
+                    if reader.at_eof():
+                        break
+                    writer.write(line.encode() if line.endswith('\n') else line.encode() + b'\n')
+                    await writer.drain()
+                    await asyncio.sleep(1 / self.bars_per_sec)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+async def receive_rows(port, pending):
+    """Append each row a ReplayServer sends to pending until it ends the replay or this is cancelled"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        async for line in reader:
+            pending.append(line)
+    finally:
+        writer.close()
+
+class ReplayFeed:
+    """Client of a ReplayServer; buffers received rows until the next drain"""
+    
+    def __init__(self, server, loop, max_pending=LIVE_CAPACITY):
+        # Columns are matched by the file's header, as for datasets; ValueError if any is missing
+        names, first = csv_header(server.path)
+        if not any(first):
+            raise ValueError('CSV has no rows to replay')
+        self.read_options = pa_csv.ReadOptions(column_names=names)
+        self.mapping, self.convert_options = csv_convert_options(names, first)
+        self.pending = deque(maxlen=max_pending)
+        # The receiving task holds only the queue, so a feed abandoned with its
+        # session is still collected, and collecting it closes the connection
+        self.future = asyncio.run_coroutine_threadsafe(receive_rows(server.port, self.pending), loop)
+        self.finalizer = weakref.finalize(self, self.future.cancel)
+    
+    @property
+    def finished(self):
+        """Whether the replay has ended and every received row has been drained"""
+        return self.future.done() and not self.pending
+    
+    def drain(self):
+        """Parse and remove every row received since the last call"""
+        lines = []
+        while self.pending:
+            lines.append(self.pending.popleft())
+        if not lines:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        table = pa_csv.read_csv(io.BytesIO(b''.join(lines)), read_options=self.read_options,
+                                convert_options=self.convert_options)
+        return ohlcv_table(table, self.mapping).to_pandas()
+    
+    def close(self):
+        self.finalizer()
+
+def replay_file(data):
+    """Write CSV bytes to a temp file named by content hash, once"""
+    path = os.path.join(tempfile.gettempdir(), f"replay_{hashlib.sha1(data).hexdigest()[:16]}.csv")
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return path
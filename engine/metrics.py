@@ -0,0 +1,182 @@
+"""Streaming price statistics and rolling volatility estimators"""
+import numpy as np
+import pandas as pd
+
+from .simulation import BAR_INTERVALS
+
+class Moments:
+    """Welford mean/variance plus running extrema; O(1) per value, mergeable"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+    
+    @classmethod
+    def from_array(cls, values):
+        """Moments of a whole chunk, computed vectorised"""
+        m = cls()
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            m.count = len(values)
+            m.mean = float(values.mean())
+            m.m2 = float(((values - m.mean) ** 2).sum())
+            m.min = float(values.min())
+            m.max = float(values.max())
+        return m
+    
+    def add(self, x):
+        """Fold in one value"""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+    
+    def merge(self, other):
+        """Fold in another Moments (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    @property
+    def std(self):
+        """Population standard deviation (matches np.std)"""
+        return np.sqrt(self.m2 / self.count) if self.count else 0.0
+
+class PriceStats:
+    """Streaming OHLCV metrics, updated per bar or merged per chunk"""
+    
+    def __init__(self):
+        self.close = Moments()
+        self.returns = Moments()  # bar-to-bar close change, in %
+        self.range = Moments()  # high - low
+        self.volume = Moments()
+        self.first = None
+        self.last = None
+    
+    @classmethod
+    def from_frame(cls, df):
+        """Stats of an OHLCV chunk, computed vectorised"""
+        stats = cls()
+        stats.update_frame(df)
+        return stats
+    
+    def update(self, close, high, low, volume):
+        """Fold in one bar"""
+        if self.last is not None:
+            self.returns.add((close / self.last - 1) * 100)
+        else:
+            self.first = close
+        self.last = close
+        self.close.add(close)
+        self.range.add(high - low)
+        self.volume.add(volume)
+    
+    def update_frame(self, df):
+        """Fold in a chunk of bars that follows the ones seen so far"""
+        if len(df) == 0:
+            return
+        close = df['close'].to_numpy(dtype=np.float64)
+        chunk = PriceStats()
+        chunk.close = Moments.from_array(close)
+        chunk.returns = Moments.from_array((close[1:] / close[:-1] - 1) * 100)
+        chunk.range = Moments.from_array(df['high'].to_numpy() - df['low'].to_numpy())
+        chunk.volume = Moments.from_array(df['volume'].to_numpy())
+        chunk.first = float(close[0])
+        chunk.last = float(close[-1])
+        self.merge(chunk)
+    
+    def merge(self, other):
+        """Fold in the stats of a later chunk"""
+        if other.last is None:
+            return
+        if self.last is not None:
+            self.returns.add((other.first / self.last - 1) * 100)
+        else:
+            self.first = other.first
+        self.returns.merge(other.returns)
+        self.close.merge(other.close)
+        self.range.merge(other.range)
+        self.volume.merge(other.volume)
+        self.last = other.last
+    
+    @property
+    def swing(self):
+        return self.close.max - self.close.min
+    
+    @property
+    def total_return(self):
+        return (self.last - self.first) / self.first * 100
+
+def rolling_mean(x, window):
+    """Trailing moving average via cumulative sums; NaN until the window fills"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        c = np.concatenate(([0.0], np.cumsum(x)))
+        out[window - 1:] = (c[window:] - c[:-window]) / window
+    return out
+
+def rolling_std(x, window):
+    """Trailing sample standard deviation via cumulative sums of x and x**2"""
+    mean = rolling_mean(x, window)
+    mean_sq = rolling_mean(np.square(x), window)
+    var = np.maximum(mean_sq - mean ** 2, 0) * window / max(window - 1, 1)
+    return np.sqrt(var)
+
+# Volatility estimators shown on the Analysis tab: column -> legend label
+VOLATILITY_ESTIMATORS = {
+    'close_to_close': 'Close-to-Close',
+    'ewma': 'EWMA (λ=0.94)',
+    'parkinson': 'Parkinson',
+    'garman_klass': 'Garman–Klass',
+    'rogers_satchell': 'Rogers–Satchell',
+}
+
+def rolling_volatility(df, window=20, interval='1d', ewma_lambda=0.94):
+    """Rolling volatility estimators over OHLC bars
+    
+    Estimator columns are annualised volatility in percent (365-day year,
+    crypto trades every day); ``atr`` is the Average True Range in price units.
+    """
+    o = df['open'].to_numpy(dtype=np.float64)
+    h = df['high'].to_numpy(dtype=np.float64)
+    l = df['low'].to_numpy(dtype=np.float64)
+    c = df['close'].to_numpy(dtype=np.float64)
+    annualise = 100 * np.sqrt(365 * BAR_INTERVALS[interval][1])
+    
+    # Close-to-close log returns; the first bar has none
+    r = np.log(c[1:] / c[:-1])
+    c2c = np.concatenate(([np.nan], rolling_std(r, window)))
+    ewma_var = pd.Series(np.square(r)).ewm(alpha=1 - ewma_lambda, adjust=False).mean().to_numpy()
+    ewma = np.concatenate(([np.nan], np.sqrt(ewma_var)))
+    
+    # Range-based per-bar variances
+    hl = np.log(h / l)
+    co = np.log(c / o)
+    parkinson = np.square(hl) / (4 * np.log(2))
+    garman_klass = 0.5 * np.square(hl) - (2 * np.log(2) - 1) * np.square(co)
+    rogers_satchell = np.log(h / c) * np.log(h / o) + np.log(l / c) * np.log(l / o)
+    
+    prev_close = np.concatenate(([c[0]], c[:-1]))
+    true_range = np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+    
+    return pd.DataFrame({
+        'date': df['date'].to_numpy(),
+        'close_to_close': c2c * annualise,
+        'ewma': ewma * annualise,
+        'parkinson': np.sqrt(np.maximum(rolling_mean(parkinson, window), 0)) * annualise,
+        'garman_klass': np.sqrt(np.maximum(rolling_mean(garman_klass, window), 0)) * annualise,
+        'rogers_satchell': np.sqrt(np.maximum(rolling_mean(rogers_satchell, window), 0)) * annualise,
+        'atr': rolling_mean(true_range, window)
+    })
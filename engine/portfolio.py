@@ -0,0 +1,66 @@
+"""Correlated multi-asset portfolio simulation"""
+import numpy as np
+import pandas as pd
+
+from .simulation import (RNG_STREAMS, WAVE_PATTERNS, BAR_INTERVALS, bar_count, price_curve, date_axis,
+                         make_rng, generate_ohlcv)
+
+# Correlated portfolio settings
+PORTFOLIO_CAPITAL = 100_000
+PORTFOLIO_MAX_CELLS = 10_000_000  # bars x assets held in memory (~80 MB of float64)
+
+def portfolio_interval(days, n_assets, interval):
+    """Finest interval, no finer than requested, whose price matrix fits PORTFOLIO_MAX_CELLS"""
+    names = list(BAR_INTERVALS)
+    for name in names[names.index(interval):]:
+        if bar_count(days, name) * n_assets <= PORTFOLIO_MAX_CELLS:
+            return name
+    return names[-1]
+
+def portfolio_params(n_assets, base, amplitude, frequency, drift, noise, avg_corr, rng):
+    """Per-asset pattern parameters scattered around the sidebar values, plus factor loadings"""
+    loading = np.clip(np.sqrt(avg_corr) + 0.1 * rng.standard_normal(n_assets), 0, 0.99)
+    return pd.DataFrame({
+        'asset': [f'ASSET-{k + 1:03d}' for k in range(n_assets)],
+        'pattern': rng.choice(list(WAVE_PATTERNS), n_assets),
+        'base': base * rng.uniform(0.5, 1.5, n_assets),
+        'amplitude': amplitude * rng.uniform(0.25, 1.5, n_assets),
+        'frequency': np.maximum(1, frequency * rng.uniform(0.5, 2, n_assets)),
+        'drift': drift * rng.uniform(-1, 2, n_assets),
+        'noise': noise * rng.uniform(0.25, 1.5, n_assets),
+        'loading': loading
+    })
+
+def factor_correlation(loading):
+    """One-factor correlation matrix: rho_ij = b_i * b_j off the diagonal"""
+    corr = np.outer(loading, loading)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+def simulate_portfolio(days, params, corr, interval='1d', rng=None):
+    """Simulate correlated price paths for every asset in params; returns (dates, bars x assets prices)"""
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    n_bars = bar_count(days, interval)
+    curves = np.empty((n_bars, len(params)))
+    for pattern, group in params.groupby('pattern'):
+        cols = group.index.to_numpy()
+        curves[:, cols] = price_curve(days, group['base'].to_numpy(), group['amplitude'].to_numpy(),
+                                      group['frequency'].to_numpy(), group['drift'].to_numpy(), pattern, interval)
+    
+    # One batched draw, correlated across assets through the Cholesky factor
+    chol = np.linalg.cholesky(corr)
+    shocks = rng.standard_normal((n_bars, len(params))) @ chol.T
+    prices = np.maximum(100, curves + shocks * params['noise'].to_numpy())
+    
+    return date_axis(days, interval), prices
+
+def portfolio_value(prices, capital=PORTFOLIO_CAPITAL):
+    """Value of an equal-weight buy-and-hold portfolio over time"""
+    units = capital / prices.shape[1] / prices[0]
+    return prices @ units
+
+def portfolio_asset_ohlcv(dates, prices, k, seed):
+    """OHLCV frame for asset k of a simulated portfolio"""
+    return generate_ohlcv(dates, prices[:, k], make_rng(seed, (RNG_STREAMS['portfolio'], k)))
@@ -0,0 +1,174 @@
+"""Price path, OHLCV and Monte Carlo simulation"""
+import numpy as np
+import pandas as pd
+
+from .timing import timed
+
+# Stream ids for the assets simulated in one session; each gets an
+# independent Generator derived from the session seed
+RNG_STREAMS = {'main': 0, 'compare': 1, 'ensemble': 3, 'live': 4, 'portfolio': 5, 'sweep': 6}
+
+def make_rng(seed, stream=0):
+    """Create an independent PCG64 generator for one stream (int or tuple of ints) of a seed"""
+    seq = np.random.SeedSequence(seed, spawn_key=stream if isinstance(stream, tuple) else (stream,))
+    return np.random.Generator(np.random.PCG64(seq))
+
+def new_seed():
+    """Draw a fresh seed from OS entropy"""
+    return int(np.random.SeedSequence().entropy % 2**32)
+
+# Wave shape for each price pattern, as a function of the phase array t
+WAVE_PATTERNS = {
+    'Sine Wave (Smooth Cycles)': lambda t: np.sin(t),
+    'Cosine Wave (Phase Shift)': lambda t: np.cos(t),
+    'Combined Waves': lambda t: 0.6 * np.sin(t) + 0.4 * np.cos(2 * t),
+    'Realistic Behavior': lambda t: 0.5 * np.sin(t) + 0.3 * np.cos(1.7 * t) + 0.2 * np.sin(3.1 * t),
+}
+
+# Bar intervals: pandas frequency and number of bars per day
+BAR_INTERVALS = {
+    '1m': ('1min', 1440),
+    '5m': ('5min', 288),
+    '1h': ('1h', 24),
+    '1d': ('1D', 1),
+}
+
+def bar_count(days, interval='1d'):
+    """Number of bars in a horizon of ``days`` at the given interval"""
+    return days * BAR_INTERVALS[interval][1]
+
+def price_curve(days, base, amplitude, frequency, drift, pattern, interval='1d', start=0, count=None):
+    """Deterministic part of a price path: base + wave + drift trend
+    
+    ``start``/``count`` select a window of bar indices; indices past the
+    horizon continue the same cycle and trend (used by the live feed).
+    Numeric parameters may be arrays (one entry per asset), giving a
+    (bars, assets) matrix.
+    """
+    bars_per_day = BAR_INTERVALS[interval][1]
+    n = days * bars_per_day
+    if count is None:
+        count = n - start
+    i = np.arange(start, start + count, dtype=np.float64)
+    if max(np.ndim(base), np.ndim(amplitude), np.ndim(frequency), np.ndim(drift)) > 0:
+        i = i[:, None]  # bars down, assets across
+    t = (i / n) * 2 * np.pi * frequency
+    
+    wave_fn = WAVE_PATTERNS.get(pattern)
+    wave = amplitude * wave_fn(t) if wave_fn is not None else np.zeros(t.shape)
+    
+    # Drift is expressed per day whatever the bar size
+    return base + wave + drift * (i / bars_per_day)
+
+def date_axis(days, interval='1d'):
+    """datetime64 bar axis covering the last ``days`` days"""
+    freq = BAR_INTERVALS[interval][0]
+    start = (pd.Timestamp.now() - pd.Timedelta(days=days)).floor(freq)
+    return pd.date_range(start=start, periods=bar_count(days, interval), freq=freq).to_numpy()
+
+def format_dates(dates, interval='1d'):
+    """Format bar timestamps as strings at the interval's resolution"""
+    unit = 'D' if interval == '1d' else 'm'
+    return np.datetime_as_string(np.asarray(dates, dtype='datetime64[ns]'), unit=unit)
+
+def simulate_price(days, base, amplitude, frequency, drift, noise, pattern, rng=None, interval='1d'):
+    """Simulate cryptocurrency price movements"""
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    curve = price_curve(days, base, amplitude, frequency, drift, pattern, interval)
+    noise_vals = noise * rng.standard_normal(len(curve))
+    prices = np.maximum(100, curve + noise_vals)
+    
+    return date_axis(days, interval), prices
+
+# Monte Carlo ensemble settings
+ENSEMBLE_PERCENTILES = [5, 25, 50, 75, 95]
+ENSEMBLE_CHUNK_ELEMENTS = 2_000_000  # ~16 MB of float64 per simulated block
+
+def simulate_ensemble(n_paths, days, base, amplitude, frequency, drift, noise, pattern, rng=None,
+                      chunk_elements=ENSEMBLE_CHUNK_ELEMENTS):
+    """Simulate many price paths and summarise them as percentile bands and per-path stats"""
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    curve = price_curve(days, base, amplitude, frequency, drift, pattern)
+    bands = np.empty((len(ENSEMBLE_PERCENTILES), days))
+    
+    # Running per-path moments and extrema, merged block by block
+    count = 0
+    mean = np.zeros(n_paths)
+    m2 = np.zeros(n_paths)
+    high = np.full(n_paths, -np.inf)
+    low = np.full(n_paths, np.inf)
+    
+    # Walk the time axis in blocks of all paths so peak memory stays bounded
+    step = max(1, chunk_elements // max(1, n_paths))
+    for start in range(0, days, step):
+        stop = min(days, start + step)
+        k = stop - start
+        
+        block = rng.standard_normal((n_paths, k))
+        block *= noise
+        block += curve[start:stop]
+        np.maximum(block, 100, out=block)
+        
+        bands[:, start:stop] = np.percentile(block, ENSEMBLE_PERCENTILES, axis=0)
+        
+        block_mean = block.mean(axis=1)
+        block_m2 = ((block - block_mean[:, None]) ** 2).sum(axis=1)
+        delta = block_mean - mean
+        total = count + k
+        mean += delta * (k / total)
+        m2 += block_m2 + delta ** 2 * (count * k / total)
+        count = total
+        
+        np.maximum(high, block.max(axis=1), out=high)
+        np.minimum(low, block.min(axis=1), out=low)
+        final = block[:, -1].copy()
+    
+    band_df = pd.DataFrame(bands.T, columns=[f'p{p}' for p in ENSEMBLE_PERCENTILES])
+    band_df.insert(0, 'date', date_axis(days))
+    
+    stats = pd.DataFrame({
+        'final_price': final,
+        'std': np.sqrt(m2 / count),
+        'swing': high - low
+    })
+    
+    return band_df, stats
+
+def generate_ohlcv(dates, close_prices, rng=None):
+    """Generate OHLCV data from close prices"""
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    close = np.asarray(close_prices, dtype=np.float64)
+    n = len(close)
+    
+    # One row of draws per bar: spread, open offset, upper wick, lower wick, volume
+    r = rng.random((n, 5))
+    spread = close * (0.01 + r[:, 0] * 0.03)
+    open_price = close + (r[:, 1] - 0.5) * spread
+    high = np.maximum(open_price, close) + r[:, 2] * spread
+    low = np.minimum(open_price, close) - r[:, 3] * spread
+    volume = (500 + r[:, 4] * 9500).astype(np.int64)
+    
+    return pd.DataFrame({
+        'date': np.asarray(dates),
+        'open': open_price,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    })
+
+OHLCV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+def simulate_asset(days, base, amplitude, frequency, drift, noise, pattern, seed, stream, interval='1d'):
+    """Simulate one asset's OHLCV frame from its seed stream"""
+    rng = make_rng(seed, stream)
+    with timed('simulate_price'):
+        dates, prices = simulate_price(days, base, amplitude, frequency, drift, noise, pattern, rng, interval)
+    with timed('generate_ohlcv'):
+        return generate_ohlcv(dates, prices, rng)
@@ -0,0 +1,47 @@
+"""Parameter sensitivity sweeps over amplitude x noise x frequency"""
+import numpy as np
+
+from .simulation import price_curve
+
+# Sensitivity sweep settings
+SWEEP_CHUNK_ELEMENTS = 4_000_000  # ~32 MB of float64 price paths per block
+SWEEP_METRICS = {'std': 'Std Dev ($)', 'swing': 'Max Swing ($)', 'return': 'Total Return (%)'}
+
+def sweep_metrics(days, base, drift, pattern, amplitudes, noises, frequencies, rng=None,
+                  chunk_elements=SWEEP_CHUNK_ELEMENTS):
+    """Std dev, swing and total return for every (amplitude, noise, frequency) combination
+    
+    All combinations share one noise draw (common random numbers), so cells
+    differ only by their parameters. Returns arrays shaped
+    (len(amplitudes), len(noises), len(frequencies)).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    amplitudes = np.asarray(amplitudes, dtype=np.float64)
+    noises = np.asarray(noises, dtype=np.float64)
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    shape = (len(amplitudes), len(noises), len(frequencies))
+    
+    # Unit waves per frequency, (frequencies, bars), and the shared base + trend
+    waves = price_curve(days, 0, 1, frequencies, 0, pattern).T
+    trend = price_curve(days, base, 0, 1, drift, pattern)
+    z = rng.standard_normal(len(trend))
+    
+    total = int(np.prod(shape))
+    results = {metric: np.empty(total) for metric in SWEEP_METRICS}
+    step = max(1, chunk_elements // len(trend))
+    for start in range(0, total, step):
+        flat = np.arange(start, min(start + step, total))
+        a, n, f = np.unravel_index(flat, shape)
+        
+        prices = amplitudes[a, None] * waves[f]
+        prices += noises[n, None] * z
+        prices += trend
+        np.maximum(prices, 100, out=prices)
+        
+        results['std'][flat] = prices.std(axis=1)
+        results['swing'][flat] = prices.max(axis=1) - prices.min(axis=1)
+        results['return'][flat] = (prices[:, -1] / prices[:, 0] - 1) * 100
+    
+    return {metric: values.reshape(shape) for metric, values in results.items()}
@@ -0,0 +1,68 @@
+"""Per-stage wall-clock timing, a no-op unless a StageTimer is active"""
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Timing switch and JSON-lines destination (stderr when unset)
+TIMING_ENV = 'CVV_TIMING'
+TIMING_LOG_ENV = 'CVV_TIMING_LOG'
+ACTIVE_TIMER = contextvars.ContextVar('active_timer', default=None)
+UNTIMED = contextlib.nullcontext()
+
+class StageTimer:
+    """Wall-clock time of each (possibly nested) named stage of one rerun"""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = []
+        self.depth = 0
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one stage"""
+        record = {'stage': name, 'depth': self.depth, 'ms': 0.0}
+        self.stages.append(record)
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['ms'] = (time.perf_counter() - start) * 1e3
+            self.depth -= 1
+    
+    def total_ms(self):
+        return (time.perf_counter() - self.start) * 1e3
+    
+    def to_frame(self):
+        """Stages in execution order, nested stages indented"""
+        return pd.DataFrame({
+            'stage': ['\u2003' * r['depth'] + r['stage'] for r in self.stages],
+            'ms': [r['ms'] for r in self.stages]
+        })
+    
+    def log(self, **context):
+        """Write the timings as one JSON line"""
+        line = json.dumps({
+            'event': 'rerun_timing',
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'total_ms': round(self.total_ms(), 3),
+            **context,
+            'stages': [dict(r, ms=round(r['ms'], 3)) for r in self.stages]
+        })
+        path = os.environ.get(TIMING_LOG_ENV)
+        if path:
+            with open(path, 'a') as f:
+                f.write(line + '\n')
+        else:
+            print(line, file=sys.stderr, flush=True)
+
+def timed(name):
+    """Time a block on the active rerun's StageTimer; a shared no-op when timing is off"""
+    timer = ACTIVE_TIMER.get()
+    return UNTIMED if timer is None else timer.stage(name)
@@ -0,0 +1,16 @@
+"""Shared fixtures; also makes the engine package importable from any directory"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import simulate_asset
+
+@pytest.fixture
+def make_frame():
+    """Factory for simulated OHLCV frames"""
+    def make(days=90, interval='1h', seed=0):
+        return simulate_asset(days, 45000, 5000, 3, 50, 1500, 'Realistic Behavior', seed, 0, interval)
+    return make
@@ -0,0 +1,81 @@
+"""Batch generation: spec expansion and validation, output layout and resuming"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from engine import simulate_asset
+from engine.batch import dataset_path, expand_spec, main, run
+
+SPEC = {'amplitude': [1000, 5000], 'noise': [0, 500], 'days': 10, 'interval': '1h', 'seeds': {'start': 3, 'count': 2}}
+
+def test_expand_spec_grid_and_seeds():
+    scenarios, seeds = expand_spec(SPEC)
+    assert len(scenarios) == 4
+    assert list(scenarios['scenario']) == [0, 1, 2, 3]
+    assert set(zip(scenarios['amplitude'], scenarios['noise'])) == {(1000, 0), (1000, 500), (5000, 0), (5000, 500)}
+    assert (scenarios['days'] == 10).all() and (scenarios['base'] == 45000).all()
+    assert seeds == [3, 4]
+
+@pytest.mark.parametrize('spec, message', [
+    ({'volatility': 1}, 'Unknown spec keys: volatility'),
+    ({'pattern': 'Square'}, 'Unknown pattern'),
+    ({'interval': '15m'}, 'Unknown interval'),
+    ({'amplitude': 'x'}, "'amplitude' must be a number"),
+    ({'drift': [0, None]}, "'drift' must be a number"),
+    ({'days': 1.5}, "'days' must be a positive integer"),
+    ({'days': 0}, "'days' must be a positive integer"),
+    ({'noise': -1}, "'noise' must not be negative"),
+    ({'base': True}, "'base' must be a number"),
+    ({'seeds': [1, 'a']}, 'seeds must be non-negative integers'),
+    ({'seeds': {'start': -1, 'count': 2}}, "needs non-negative integer 'start' and 'count'"),
+])
+def test_expand_spec_rejects_bad_values(spec, message):
+    with pytest.raises(ValueError, match=message):
+        expand_spec(spec)
+
+def test_run_writes_a_readable_dataset(tmp_path):
+    out = str(tmp_path / 'out')
+    assert run(SPEC, out, workers=2) == 8
+    
+    # Metadata and temp files are hidden from dataset readers
+    data = pd.read_parquet(out)
+    assert len(data) == 8 * 240
+    assert set(data['scenario']) == {0, 1, 2, 3} and set(data['seed']) == {3, 4}
+    with open(os.path.join(out, '_spec.json')) as f:
+        assert json.load(f) == SPEC
+    assert len(pd.read_parquet(os.path.join(out, '_scenarios.parquet'))) == 4
+    
+    # A dataset matches the dashboard's main asset for the same parameters and seed
+    scenario = pd.read_parquet(os.path.join(out, '_scenarios.parquet')).iloc[3]
+    assert scenario['amplitude'] == 5000 and scenario['noise'] == 500
+    expected = simulate_asset(10, 45000, 5000, 3, 50, 500, 'Sine Wave (Smooth Cycles)', 4, 0, '1h')
+    pd.testing.assert_frame_equal(pd.read_parquet(dataset_path(out, 3, 4)), expected, check_dtype=False)
+
+def test_run_resumes_missing_datasets(tmp_path):
+    out = str(tmp_path / 'out')
+    run(SPEC, out, workers=2)
+    os.remove(dataset_path(out, 1, 3))
+    # A temp file left by an interrupted run is never read as data
+    leftover = os.path.join(os.path.dirname(dataset_path(out, 2, 4)), '.part-0.parquet')
+    open(leftover, 'wb').close()
+    
+    assert run(SPEC, out, workers=2) == 1
+    assert os.path.exists(dataset_path(out, 1, 3))
+    assert len(pd.read_parquet(out)) == 8 * 240
+
+def test_run_refuses_a_different_spec(tmp_path):
+    out = str(tmp_path / 'out')
+    run(SPEC, out, workers=1)
+    with pytest.raises(ValueError, match='different spec'):
+        run({**SPEC, 'days': 20}, out, workers=1)
+
+def test_main_reports_spec_errors(tmp_path, capsys):
+    spec = tmp_path / 'spec.json'
+    spec.write_text(json.dumps({'amplitude': 'x'}))
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(spec), str(tmp_path / 'out')])
+    assert exit_info.value.code == 2
+    assert "'amplitude' must be a number" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / 'out')
@@ -0,0 +1,63 @@
+"""The simulation cache stays under its byte cap and never evicts pinned entries"""
+import numpy as np
+
+from engine import SimulationCache
+from engine.cache import nbytes
+
+def block(n=100):
+    return np.zeros(n)  # n * 8 bytes
+
+def test_evicts_least_recently_used():
+    cache = SimulationCache(max_bytes=3 * 800)
+    for key in 'abc':
+        cache.put(key, block())
+    cache.get('a')  # now b is the oldest
+    cache.put('d', block())
+    
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.stats()['evictions'] == 1
+
+def test_byte_accounting():
+    cache = SimulationCache(max_bytes=10_000)
+    values = {'a': block(100), 'b': block(200), 'c': (block(50), block(25))}
+    for key, value in values.items():
+        cache.put(key, value)
+    cache.put('a', block(500))  # already cached; not replaced or counted twice
+    
+    assert cache.total_bytes == sum(nbytes(v) for v in values.values()) == 375 * 8
+    cache.put('d', block(1000))
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.total_bytes == sum(size for _, size in cache.entries.values())
+
+def test_oversized_value_is_not_stored():
+    cache = SimulationCache(max_bytes=800)
+    cache.put('small', block(50))
+    cache.put('huge', block(1000))
+    assert 'huge' not in cache and 'small' in cache
+
+def test_pinned_entries_sit_outside_the_cap():
+    cache = SimulationCache(max_bytes=800)
+    cache.pin('default', block(1000))
+    for i in range(5):
+        cache.put(i, block())
+    
+    assert 'default' in cache
+    assert cache.get('default') is cache.pinned['default']
+    stats = cache.stats()
+    assert stats['pinned'] == 1 and stats['bytes'] == 800 and stats['entries'] == 1
+
+def test_get_or_compute_counts_and_computes_once():
+    cache = SimulationCache(max_bytes=10_000)
+    calls = []
+    compute = lambda: calls.append(1) or block()
+    first = cache.get_or_compute('k', compute)
+    second = cache.get_or_compute('k', compute)
+    
+    assert first is second and len(calls) == 1
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+def test_cached_none_is_a_hit():
+    cache = SimulationCache(max_bytes=10_000)
+    cache.put('k', None)
+    assert cache.get_or_compute('k', lambda: 1 / 0) is None
@@ -0,0 +1,116 @@
+"""Chart data reduction keeps the shape of a series within the point budget"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from engine import (PLOTLY_TEMPLATE, chart_points, resample_ohlcv, extreme_bars, rolling_volatility, new_figure,
+                    compact_values, compact_figure)
+from engine.charts import lttb_indices
+
+def test_lttb_keeps_endpoints_and_order():
+    y = np.sin(np.linspace(0, 20, 10000))
+    idx = lttb_indices(np.arange(len(y)), y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert y[idx].max() > 0.99 and y[idx].min() < -0.99  # peaks and troughs survive
+
+def test_lttb_short_series_is_untouched():
+    assert np.array_equal(lttb_indices(np.arange(10), np.arange(10.0), 20), np.arange(10))
+
+def test_chart_points_budget():
+    dates = pd.date_range('2024-01-01', periods=5000, freq='h')
+    values = np.cos(np.linspace(0, 30, 5000))
+    x, y = chart_points(dates, values, max_points=1000)
+    assert len(x) == len(y) == 1000
+    assert x[0] == dates[0] and x[-1] == dates[-1]
+    
+    x, y = chart_points(dates, values, full_resolution=True, max_points=1000)
+    assert len(x) == 5000
+
+def test_lttb_skips_leading_nans():
+    # A rolling estimator's warm-up window: NaN before the first full window
+    y = np.sin(np.linspace(0, 20, 10000))
+    y[:30] = np.nan
+    idx = lttb_indices(np.arange(len(y)), y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 30 and idx[-1] == len(y) - 1
+    assert np.isfinite(y[idx]).all()
+    assert np.all(np.diff(idx) > 0)
+    # Each bucket picks a real extreme rather than falling back to its first point
+    assert y[idx].max() > 0.99 and y[idx].min() < -0.99
+
+def test_chart_points_drops_nans_when_downsampling(make_frame):
+    df = make_frame(days=120)
+    vol = rolling_volatility(df, 20, '1h')
+    for column in ('close_to_close', 'atr'):
+        x, y = chart_points(vol['date'], vol[column], max_points=500)
+        assert len(x) == len(y) == 500
+        assert not np.isnan(y).any()
+        assert x[0] == vol['date'][vol[column].notna()].iloc[0]
+
+def test_resample_ohlcv_aggregates_buckets(make_frame):
+    df = make_frame(days=30)  # 720 bars
+    candles = resample_ohlcv(df, 100)
+    assert len(candles) == 100
+    assert candles['date'].iloc[0] == df['date'].iloc[0]
+    assert candles['open'].iloc[0] == df['open'].iloc[0]
+    assert candles['close'].iloc[-1] == df['close'].iloc[-1]
+    assert candles['high'].max() == df['high'].max()
+    assert candles['low'].min() == df['low'].min()
+    assert candles['volume'].sum() == df['volume'].sum()
+    
+    # Each candle spans the bars up to the next candle's start
+    first_end = df.index[df['date'] == candles['date'].iloc[1]][0]
+    assert candles['high'].iloc[0] == df['high'].iloc[:first_end].max()
+    assert candles['close'].iloc[0] == df['close'].iloc[first_end - 1]
+
+def test_resample_ohlcv_short_frame_is_untouched(make_frame):
+    df = make_frame(days=2)
+    assert resample_ohlcv(df, 100) is df
+
+def test_extreme_bars_keep_largest_magnitude():
+    values = np.array([1.0, -5.0, 2.0, 3.0, -1.0, 4.0, 0.5, -0.5])
+    dates = np.arange(len(values))
+    x, y = extreme_bars(dates, values, 4)
+    assert list(x) == [0, 2, 4, 6]
+    assert list(y) == [-5.0, 3.0, 4.0, 0.5]
+
+def test_compact_figure_dates_and_axes():
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    dates = pd.date_range('2024-01-01', periods=50, freq='h').to_numpy()
+    fig = make_subplots(rows=2, cols=1)
+    fig.add_trace(go.Scatter(x=dates, y=np.arange(50.0)), row=1, col=1)
+    fig.add_trace(go.Bar(x=dates, y=np.arange(50.0)), row=2, col=1)
+    compact_figure(fig)
+    
+    for trace in fig.data:
+        assert trace.x.dtype == np.float64
+        assert trace.x[0] == pd.Timestamp('2024-01-01').value / 1e6  # epoch milliseconds
+    assert fig.layout.xaxis.type == 'date' and fig.layout.xaxis2.type == 'date'
+
+def test_compact_figure_dtypes():
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    small = np.arange(100, dtype=np.int64)
+    huge = 2**40 + np.arange(100, dtype=np.int64)
+    fig = new_figure(go.Scatter(x=small, y=45000 + np.sin(np.arange(100.0)) * 5000),
+                     go.Scatter(x=huge, y=45000 + np.arange(100) * 1e-4))
+    compact_figure(fig)
+    
+    assert fig.data[0].x.dtype == np.int32
+    assert fig.data[0].y.dtype == np.float32  # rounding well under the series' range
+    assert fig.data[1].x.dtype == np.float64  # past int32, and float32 would merge neighbours
+    assert fig.data[1].y.dtype == np.float64  # float32 would flatten a 0.01 range at 45000
+    
+    payload = json.loads(fig.to_json())
+    assert payload['layout']['template'] == json.loads(pio.templates[PLOTLY_TEMPLATE].to_json())
+    assert all('bdata' in trace['x'] and 'bdata' in trace['y'] for trace in payload['data'])
+
+def test_compact_values_keeps_nans():
+    values = np.array([np.nan, 1.0, 2.5, np.nan])
+    assert compact_values(values).dtype == np.float32
+    assert np.isnan(compact_values(values)[[0, 3]]).all()
+    assert compact_values(np.full(3, np.nan)).dtype == np.float32
@@ -0,0 +1,139 @@
+"""CSV ingestion into the Parquet cache, and queries over it"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from engine import (CACHE_DIR_ENV, OHLCV_COLUMNS, csv_to_parquet, dataset_info, dataset_intervals, infer_interval,
+                    ingest_csv, load_dataset, query_dataset, resample_batches)
+from engine.datasource import OHLCV_SCHEMA
+
+def make_bars(n=1000, freq='5min', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=n, freq=freq),
+        'open': close + rng.standard_normal(n),
+        'high': close + 2,
+        'low': close - 2,
+        'close': close,
+        'volume': rng.integers(1, 100, n).astype(np.float64)
+    })
+
+def write_csv(df, path, **kwargs):
+    df.to_csv(path, index=False, **kwargs)
+    return str(path)
+
+def test_maps_columns_by_header(tmp_path):
+    df = make_bars(100)
+    # The README's column order and header names
+    readme = df[['date', 'open', 'close', 'high', 'low', 'volume']].rename(
+        columns={'date': 'Timestamp', 'open': 'Open', 'close': 'Close', 'high': 'High', 'low': 'Low', 'volume': 'Volume'})
+    path = str(tmp_path / 'bars.parquet')
+    assert csv_to_parquet(write_csv(readme, tmp_path / 'bars.csv'), path) == len(df)
+    pd.testing.assert_frame_equal(load_dataset(path), df, check_dtype=False, check_freq=False)
+
+@pytest.mark.parametrize('dates', [
+    lambda d: d.astype('datetime64[s]').astype('int64').astype(str),  # epoch seconds
+    lambda d: d.astype('datetime64[ms]').astype('int64').astype(str),  # epoch milliseconds
+    lambda d: d.dt.strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+    lambda d: d.dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+])
+def test_parses_timestamp_formats_as_naive_utc(tmp_path, dates):
+    df = make_bars(50)
+    path = str(tmp_path / 'bars.parquet')
+    csv_to_parquet(write_csv(df.assign(date=dates(df['date'])), tmp_path / 'bars.csv'), path)
+    assert list(load_dataset(path)['date']) == list(df['date'])
+
+def test_drops_incomplete_rows(tmp_path):
+    df = make_bars(20).astype({'volume': object})
+    df.loc[5, 'volume'] = None
+    path = str(tmp_path / 'bars.parquet')
+    assert csv_to_parquet(write_csv(df, tmp_path / 'bars.csv'), path) == 19
+
+def test_rejects_out_of_order_rows(tmp_path):
+    df = make_bars(100)
+    source = write_csv(df.iloc[[*range(50), 60, *range(50, 60), *range(61, 100)]], tmp_path / 'bars.csv')
+    with pytest.raises(ValueError, match='not in time order'):
+        csv_to_parquet(source, str(tmp_path / 'bars.parquet'))
+    assert os.listdir(tmp_path) == ['bars.csv']  # no partial or temp output left behind
+
+def test_rejects_out_of_order_blocks(tmp_path):
+    # Each block is in order; the second starts before the first ends
+    df = make_bars(2000)
+    source = write_csv(pd.concat([df.iloc[1000:], df.iloc[:1000]]), tmp_path / 'bars.csv')
+    with pytest.raises(ValueError, match='not in time order'):
+        csv_to_parquet(source, str(tmp_path / 'bars.parquet'), block_bytes=4096)
+    assert os.listdir(tmp_path) == ['bars.csv']
+
+def test_rejects_missing_columns(tmp_path):
+    source = write_csv(make_bars(10).drop(columns=['high', 'volume']), tmp_path / 'bars.csv')
+    with pytest.raises(ValueError, match='missing OHLCV columns: high, volume'):
+        csv_to_parquet(source, str(tmp_path / 'bars.parquet'))
+
+def test_rejects_files_without_complete_rows(tmp_path):
+    source = tmp_path / 'bars.csv'
+    source.write_text('date,open,high,low,close,volume\n2024-01-01,1,2,0,1,\n')
+    with pytest.raises(ValueError, match='no complete OHLCV rows'):
+        csv_to_parquet(str(source), str(tmp_path / 'bars.parquet'))
+    assert os.listdir(tmp_path) == ['bars.csv']
+
+def test_ingest_caches_by_content(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / 'cache'))
+    df = make_bars(100)
+    first = ingest_csv(write_csv(df, tmp_path / 'a.csv'))
+    assert ingest_csv(write_csv(df, tmp_path / 'b.csv')) == first
+    with open(tmp_path / 'a.csv', 'rb') as f:
+        assert ingest_csv(f) == first
+        assert f.tell() == 0  # rewound for the caller
+    assert os.listdir(tmp_path / 'cache') == [os.path.basename(first)]
+
+@pytest.mark.parametrize('freq, interval', [
+    ('1min', '1m'), ('5min', '5m'), ('15min', '1h'), ('30min', '1h'), ('1h', '1h'), ('4h', '1d'), ('1D', '1d'),
+])
+def test_infer_interval_never_finer_than_the_bars(freq, interval):
+    assert infer_interval(pd.date_range('2024-01-01', periods=50, freq=freq)) == interval
+
+@pytest.mark.parametrize('freq, interval, exact', [('5min', '5m', True), ('15min', '1h', False)])
+def test_dataset_info(tmp_path, freq, interval, exact):
+    df = make_bars(500, freq)
+    path = str(tmp_path / 'bars.parquet')
+    csv_to_parquet(write_csv(df, tmp_path / 'bars.csv'), path)
+    info = dataset_info(path)
+    assert (info['first'], info['last'], info['rows']) == (df['date'].iloc[0], df['date'].iloc[-1], 500)
+    assert (info['interval'], info['exact']) == (interval, exact)
+
+def expected_resample(df, rule):
+    return df.set_index('date').resample(rule).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}).dropna().reset_index()
+
+@pytest.mark.parametrize('batch_rows', [7, 12, 100, 1000])
+def test_resample_batches_across_batch_boundaries(batch_rows):
+    df = make_bars()
+    batches = pa.Table.from_pandas(df, schema=OHLCV_SCHEMA, preserve_index=False).to_batches(max_chunksize=batch_rows)
+    result = resample_batches(batches, '1h')
+    pd.testing.assert_frame_equal(result[OHLCV_COLUMNS], expected_resample(df, '1h'), check_dtype=False,
+                                  check_freq=False)
+
+def test_resample_batches_empty():
+    assert resample_batches([], '1h').empty
+
+def test_query_dataset_range_and_resolution(tmp_path):
+    df = make_bars(2000)
+    path = str(tmp_path / 'bars.parquet')
+    csv_to_parquet(write_csv(df, tmp_path / 'bars.csv'), path)
+    start, end = df['date'][100], df['date'][700]
+    
+    window = df.iloc[100:700].reset_index(drop=True)
+    pd.testing.assert_frame_equal(query_dataset(path, start, end), window, check_dtype=False, check_freq=False)
+    pd.testing.assert_frame_equal(query_dataset(path, start, end, '1h'), expected_resample(window, '1h'),
+                                  check_dtype=False, check_freq=False)
+    assert query_dataset(path, end=df['date'][0]).empty
+
+def test_dataset_intervals_keep_the_range_under_the_cap():
+    start = pd.Timestamp('2024-01-01')
+    assert dataset_intervals('5m', start, start + pd.Timedelta(days=20), max_bars=5000) == ['1h', '1d']
+    assert dataset_intervals('1m', start, start + pd.Timedelta(days=1), max_bars=5000) == ['1m', '5m', '1h', '1d']
+    assert dataset_intervals('1h', start, start + pd.Timedelta(days=100_000), max_bars=5000) == ['1d']
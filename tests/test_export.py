@@ -0,0 +1,35 @@
+"""Every export format reads back as the frame it was written from"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from engine import EXPORT_FORMATS, export_ohlcv
+
+def read_back(data, fmt):
+    if fmt == 'CSV':
+        return pd.read_csv(data, parse_dates=['date'])
+    if fmt == 'Parquet':
+        return pq.read_table(data).to_pandas()
+    return pa.ipc.open_file(data).read_all().to_pandas()
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+@pytest.mark.parametrize('interval', ['1d', '1h'])
+def test_round_trip(make_frame, fmt, interval):
+    df = make_frame(days=20, interval=interval)
+    # Chunks smaller than the frame, so the writers see several of them
+    data = export_ohlcv(df, fmt, interval, chunk_rows=7)
+    pd.testing.assert_frame_equal(read_back(data, fmt), df, check_dtype=False)
+
+def test_csv_has_one_header_and_interval_dates(make_frame):
+    df = make_frame(days=5, interval='1d')
+    lines = export_ohlcv(df, 'CSV', '1d', chunk_rows=2).getvalue().decode().splitlines()
+    assert lines[0] == 'date,open,high,low,close,volume'
+    assert len(lines) == len(df) + 1
+    assert lines[1].split(',')[0] == str(df['date'].iloc[0].date())
+
+def test_writes_to_a_given_file(make_frame, tmp_path):
+    df = make_frame(days=3)
+    with open(tmp_path / 'bars.parquet', 'wb') as f:
+        export_ohlcv(df, 'Parquet', '1h', out=f)
+    assert len(pq.read_table(tmp_path / 'bars.parquet')) == len(df)
@@ -0,0 +1,106 @@
+"""Live feeds: the ring buffer's wraparound and the CSV replay client"""
+import asyncio
+import gc
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from engine import OHLCVRingBuffer, ReplayServer, ReplayFeed
+
+def test_ring_buffer_wraparound(make_frame):
+    df = make_frame(days=10)
+    buffer = OHLCVRingBuffer(capacity=100)
+    for start in range(0, 230, 23):  # chunks that straddle the end of the buffer
+        buffer.append(df.iloc[start:start + 23])
+    
+    frame = buffer.to_frame()
+    expected = df.iloc[130:230].reset_index(drop=True)
+    assert buffer.size == 100
+    pd.testing.assert_frame_equal(frame, expected[frame.columns], check_dtype=False)
+
+def test_ring_buffer_keeps_tail_of_oversized_append(make_frame):
+    df = make_frame(days=10)
+    buffer = OHLCVRingBuffer(capacity=50)
+    buffer.append(df.iloc[:7])
+    buffer.append(df.iloc[7:200])
+    assert list(buffer.to_frame()['date']) == list(df['date'].iloc[150:200])
+
+def test_ring_buffer_partial_fill(make_frame):
+    df = make_frame(days=10)
+    buffer = OHLCVRingBuffer(capacity=100)
+    buffer.append(df.iloc[:0])
+    buffer.append(df.iloc[:40])
+    assert list(buffer.to_frame()['close']) == list(df['close'].iloc[:40])
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+def start_server(loop, path, bars_per_sec=200):
+    server = ReplayServer(str(path), bars_per_sec)
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+    return server
+
+def drain_until_finished(feed, timeout=5):
+    parts = []
+    deadline = time.monotonic() + timeout
+    while not feed.finished and time.monotonic() < deadline:
+        time.sleep(0.05)
+        parts.append(feed.drain())
+    return pd.concat(parts, ignore_index=True)
+
+def test_replay_maps_columns_by_header_and_plays_once(loop, tmp_path):
+    # The README's column order
+    path = tmp_path / 'bars.csv'
+    path.write_text('Timestamp,Open,Close,High,Low,Volume\n' + ''.join(
+        f'2024-01-01T{h:02d}:00:00Z,{100 + h},{101 + h},{105 + h},{95 + h},{1000 + h}\n' for h in range(20)))
+    feed = ReplayFeed(start_server(loop, path), loop)
+    df = drain_until_finished(feed)
+    
+    assert feed.finished
+    assert len(df) == 20
+    assert (df['date'].diff().dropna() > pd.Timedelta(0)).all()
+    assert list(df.iloc[0][['open', 'high', 'low', 'close', 'volume']]) == [100, 105, 95, 101, 1000]
+
+def test_replay_rejects_files_without_rows(loop, tmp_path):
+    path = tmp_path / 'bars.csv'
+    path.write_text('Timestamp,Open,Close,High,Low,Volume\n')
+    with pytest.raises(ValueError, match='no rows'):
+        ReplayFeed(start_server(loop, path), loop)
+
+def test_replay_rejects_missing_columns(loop, tmp_path):
+    path = tmp_path / 'bars.csv'
+    path.write_text('Timestamp,Open,Close\n2024-01-01,1,2\n')
+    with pytest.raises(ValueError, match='missing OHLCV columns'):
+        ReplayFeed(start_server(loop, path), loop)
+
+def test_replay_server_ends_when_client_closes(loop, tmp_path):
+    path = tmp_path / 'bars.csv'
+    path.write_text('date,open,high,low,close,volume\n' + '2024-01-01,1,2,0,1,5\n' * 1000)
+    feed = ReplayFeed(start_server(loop, path, bars_per_sec=50), loop)
+    time.sleep(0.1)
+    feed.close()
+    time.sleep(0.1)
+    # Neither the client task nor the server's handler is left running
+    assert asyncio.run_coroutine_threadsafe(other_tasks(), loop).result(timeout=2) == 0
+
+def test_abandoned_replay_feed_is_closed(loop, tmp_path):
+    # A session that ends with Live Mode on just drops its feed
+    path = tmp_path / 'bars.csv'
+    path.write_text('date,open,high,low,close,volume\n' + '2024-01-01,1,2,0,1,5\n' * 1000)
+    feed = ReplayFeed(start_server(loop, path, bars_per_sec=50), loop)
+    time.sleep(0.1)
+    del feed
+    gc.collect()
+    time.sleep(0.1)
+    assert asyncio.run_coroutine_threadsafe(other_tasks(), loop).result(timeout=2) == 0
+
+async def other_tasks():
+    return len(asyncio.all_tasks() - {asyncio.current_task()})
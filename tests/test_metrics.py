@@ -0,0 +1,55 @@
+"""Streaming metrics agree with one-pass numpy over the same bars"""
+import numpy as np
+import pytest
+
+from engine import Moments, PriceStats
+
+def test_moments_merge_matches_one_pass():
+    values = np.random.default_rng(0).normal(100, 15, 1001)
+    merged = Moments()
+    for chunk in np.array_split(values, 7):
+        merged.merge(Moments.from_array(chunk))
+    merged.merge(Moments())  # empty chunks are a no-op
+    
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std())
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+def test_moments_add_matches_from_array():
+    values = np.random.default_rng(1).normal(0, 1, 200)
+    added = Moments()
+    for x in values:
+        added.add(x)
+    whole = Moments.from_array(values)
+    assert added.mean == pytest.approx(whole.mean)
+    assert added.std == pytest.approx(whole.std)
+
+def test_price_stats_chunked_matches_one_pass(make_frame):
+    df = make_frame()
+    whole = PriceStats.from_frame(df)
+    chunked = PriceStats()
+    for start in range(0, len(df), 500):
+        chunked.update_frame(df.iloc[start:start + 500])
+    
+    close = df['close'].to_numpy()
+    returns = (close[1:] / close[:-1] - 1) * 100
+    for stats in (whole, chunked):
+        assert stats.close.count == len(df)
+        assert stats.close.std == pytest.approx(close.std())
+        assert stats.returns.count == len(returns)
+        assert stats.returns.std == pytest.approx(returns.std())
+        assert stats.range.mean == pytest.approx((df['high'] - df['low']).mean())
+        assert stats.volume.mean == pytest.approx(df['volume'].mean())
+        assert stats.total_return == pytest.approx((close[-1] / close[0] - 1) * 100)
+        assert stats.swing == pytest.approx(close.max() - close.min())
+
+def test_price_stats_per_bar_matches_chunked(make_frame):
+    df = make_frame(days=10)
+    per_bar = PriceStats()
+    for row in df.itertuples():
+        per_bar.update(row.close, row.high, row.low, row.volume)
+    chunked = PriceStats.from_frame(df)
+    assert per_bar.returns.mean == pytest.approx(chunked.returns.mean)
+    assert per_bar.returns.std == pytest.approx(chunked.returns.std)
+    assert per_bar.last == chunked.last